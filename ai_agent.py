@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
+import argparse
+import asyncio
 import sys
 import os
 import glob
+import hashlib
 import json
+import sqlite3
 import time
 
 import openai
+import requests
 from openai.error import RateLimitError
 from dotenv import load_dotenv
 
@@ -14,8 +19,11 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException, WebDriverException
 
 from colorama import init, Fore, Style
+
+from llm_cache import achat_completion_text, chat_completion_text, count_tokens, is_json_object
 init(autoreset=True)
 
 # -----------------------------
@@ -23,6 +31,21 @@ init(autoreset=True)
 # -----------------------------
 load_dotenv()
 openai.api_key = os.getenv("OPENAI_API_KEY")
+APP_URL = os.getenv("PROMANAGE_APP_URL", "http://localhost:3000")
+API_URL = os.getenv("PROMANAGE_API_URL", "http://localhost:5000")
+WAIT_SECONDS = 15
+# How long to wait for the milestone list before concluding it is empty.
+LIST_WAIT_SECONDS = 5
+
+# Batch mode: context window per model, the share of it reserved for the JSON
+# answer (which repeats every milestone), and requests in flight at once.
+CONTEXT_TOKENS = {"gpt-4": 8192, "gpt-3.5-turbo": 16385}
+MAX_MILESTONES_PER_REQUEST = 200
+BATCH_CONCURRENCY = 4
+# Verdicts from earlier runs, so the LLM is only asked about new or changed milestones.
+VERDICT_PATH = os.getenv(
+    "AI_VERDICT_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ai_verdicts.sqlite")
+)
 
 def get_last_n_files(dir_path, patterns, n=3):
     files = []
@@ -30,7 +53,7 @@ def get_last_n_files(dir_path, patterns, n=3):
         files.extend(glob.glob(os.path.join(dir_path, pat)))
     return sorted(set(files), key=os.path.getmtime, reverse=True)[:n]
 
-def check_milestones_from_text(aggregated_text, domain, model="gpt-4"):
+def build_check_messages(aggregated_text, domain):
     system_msg = {
         "role": "system",
         "content": (
@@ -53,89 +76,430 @@ Example:
 }}
 """
     }
+    return [system_msg, user_msg]
 
-    resp = openai.ChatCompletion.create(
+def check_milestones_from_text(aggregated_text, domain, model="gpt-4"):
+    return chat_completion_text(
         model=model,
-        messages=[system_msg, user_msg],
+        messages=build_check_messages(aggregated_text, domain),
         temperature=0
     )
-    return resp.choices[0].message.content.strip()
-def mark_specific_milestone_completed(milestone_name, employee_email):
+
+# -----------------------------
+# Batch mode: many employees, one process
+# -----------------------------
+def load_batch(path):
     """
-    Uses Selenium to log in, navigate to My Milestones in your React sidebar,
-    and click the Complete button for the given milestone_name.
+    Reads [{"employee_email", "domain", "milestones": [...]}, ...] from a JSON
+    file, or from stdin when path is "-". {"employees": [...]} is accepted too.
+    Milestones are names, or {"id", "name"} objects when the caller knows the ids.
+    """
+    if path == "-":
+        data = json.load(sys.stdin)
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    return data["employees"] if isinstance(data, dict) else data
+
+def milestone_entries(employee):
     """
+    (verdict key, text, milestone id) per milestone: one per id when ids are
+    given, otherwise one per distinct text (the id is then None).
+    """
+    entries = {}
+    for item in employee.get("milestones", []):
+        if isinstance(item, dict):
+            text, milestone_id = (item.get("name") or "").strip(), item.get("id")
+        else:
+            text, milestone_id = (item or "").strip(), None
+        if not text:
+            continue
+        if milestone_id is not None:
+            key = f"id:{milestone_id}"
+        else:
+            digest = hashlib.sha256(f"{employee.get('domain', '')}\0{text}".encode("utf-8")).hexdigest()
+            key = f"text:{digest}"
+        entries.setdefault(key, (text, milestone_id))
+    return [(key, text, milestone_id) for key, (text, milestone_id) in entries.items()]
+
+def evidence_hash(domain, text):
+    """Hash of everything the LLM is shown about one milestone."""
+    payload = json.dumps(build_check_messages(text, domain), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class VerdictStore:
+    """
+    Persistent milestone verdicts keyed on (milestone, evidence hash). A "YES" is
+    reused whatever the evidence; a "NO" only while the evidence is unchanged.
+    path=None keeps the store in memory.
+    """
+
+    def __init__(self, path=VERDICT_PATH):
+        self._db = sqlite3.connect(path or ":memory:")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            "milestone_key TEXT PRIMARY KEY, evidence_hash TEXT NOT NULL, "
+            "verdict TEXT NOT NULL, checked_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def lookup(self, milestone_key, evidence):
+        row = self._db.execute(
+            "SELECT evidence_hash, verdict FROM verdicts WHERE milestone_key = ?", (milestone_key,)
+        ).fetchone()
+        if row is None:
+            return None
+        stored_evidence, verdict = row
+        if verdict == "YES" or stored_evidence == evidence:
+            return verdict
+        return None
+
+    def record(self, rows):
+        """rows: (milestone_key, evidence_hash, verdict) tuples."""
+        now = time.time()
+        self._db.executemany(
+            "INSERT OR REPLACE INTO verdicts (milestone_key, evidence_hash, verdict, checked_at) "
+            "VALUES (?, ?, ?, ?)",
+            [(key, evidence, verdict, now) for key, evidence, verdict in rows],
+        )
+        self._db.commit()
+
+def pack_milestones(texts, domain, model):
+    """
+    Splits texts into as few groups as fit one request each: the prompt plus, per
+    milestone, its line in the question and its entry in the JSON answer.
+    """
+    budget = CONTEXT_TOKENS.get(model, 4096) - sum(
+        count_tokens(m["content"], model) for m in build_check_messages("", domain)
+    ) - 32
+    groups, current, used = [], [], 0
+    for text in texts:
+        cost = 2 * count_tokens(text, model) + 8  # line + '"text": "YES",'
+        if current and (used + cost > budget or len(current) >= MAX_MILESTONES_PER_REQUEST):
+            groups.append(current)
+            current, used = [], 0
+        current.append(text)
+        used += cost
+    if current:
+        groups.append(current)
+    return groups
+
+async def check_group(domain, texts, model, semaphore):
+    """Verdicts for one packed request: {text: "YES"/"NO"}, empty if the answer is unusable."""
+    aggregated = "\n".join(texts)
+    async with semaphore:
+        try:
+            try:
+                raw = await achat_completion_text(model=model, messages=build_check_messages(aggregated, domain),
+                                                  validate=is_json_object, temperature=0)
+            except RateLimitError:
+                print(Fore.YELLOW + f"[WARN] {model} limit hit, retrying with gpt-3.5-turbo")
+                raw = await achat_completion_text(model="gpt-3.5-turbo",
+                                                  messages=build_check_messages(aggregated, domain),
+                                                  validate=is_json_object, temperature=0)
+        except openai.error.OpenAIError as e:
+            # One failed request leaves its milestones "unknown" instead of aborting the batch.
+            print(Fore.RED + Style.BRIGHT + f"[ERROR] OpenAI request failed for {domain}: {e}")
+            return {}
+    try:
+        answer = json.loads(raw)
+    except ValueError as e:
+        print(Fore.RED + Style.BRIGHT + f"[ERROR] Could not parse JSON from AI for {domain}: {e}")
+        return {}
+    if not isinstance(answer, dict):
+        print(Fore.RED + Style.BRIGHT + f"[ERROR] AI answer for {domain} is not a JSON object")
+        return {}
+    # Match answers back case- and whitespace-insensitively.
+    by_text = {str(k).strip().lower(): str(v).strip().upper() for k, v in answer.items()}
+    return {text: by_text[text.lower()] for text in texts if text.lower() in by_text}
+
+def plan_requests(milestones, model):
+    """
+    Groups {(domain, text)} into packed requests. Returns [(domain, [texts])].
+    Each (domain, text) pair is asked about once, whoever it belongs to.
+    """
+    texts_by_domain = {}
+    for domain, text in milestones:
+        texts_by_domain.setdefault(domain, {})[text] = None
+    return [(domain, group) for domain, texts in texts_by_domain.items()
+            for group in pack_milestones(list(texts), domain, model)]
+
+async def check_batch_async(jobs, model="gpt-4", concurrency=BATCH_CONCURRENCY):
+    """Runs planned requests concurrently. Returns {(domain, text): verdict or None}."""
+    semaphore = asyncio.Semaphore(concurrency)
+    answers = await asyncio.gather(*(check_group(domain, group, model, semaphore) for domain, group in jobs))
+    verdicts = {}
+    for (domain, group), answer in zip(jobs, answers):
+        for text in group:
+            verdicts[(domain, text)] = answer.get(text)
+    return verdicts
+
+def run_batch(employees, model="gpt-4", concurrency=BATCH_CONCURRENCY, store=None, recheck=False):
+    """
+    Checks every employee's milestones in one pass, asking the LLM only about
+    milestones the verdict store cannot answer. Returns
+    {employee_email: {"done": [...], "not_done": [...], "unknown": [...]}}, each
+    milestone as {"id": ..., "name": ...} (id None when none was given);
+    "unknown" holds milestones the AI gave no usable answer for.
+    """
+    store = store or VerdictStore()
+    known, delta, all_pairs = {}, [], set()
+    for employee in employees:
+        domain = employee.get("domain", "")
+        for key, text, _ in milestone_entries(employee):
+            all_pairs.add((domain, text))
+            evidence = evidence_hash(domain, text)
+            verdict = None if recheck else store.lookup(key, evidence)
+            if verdict is None:
+                delta.append((key, evidence, domain, text))
+            else:
+                known[key] = verdict
+
+    jobs = plan_requests({(domain, text) for _, _, domain, text in delta}, model)
+    avoided = len(plan_requests(all_pairs, model)) - len(jobs)
+    print(Fore.CYAN + f"Checking {len({(d, t) for _, _, d, t in delta})} milestones in {len(jobs)} request(s); "
+          f"{len(known)} verdicts reused, {avoided} LLM call(s) avoided")
+    asked = asyncio.run(check_batch_async(jobs, model, concurrency)) if jobs else {}
+    fresh = [(key, evidence, asked.get((domain, text))) for key, evidence, domain, text in delta]
+    store.record([row for row in fresh if row[2] is not None])
+    known.update((key, verdict) for key, _, verdict in fresh)
+
+    results = {}
+    for employee in employees:
+        result = results.setdefault(employee["employee_email"], {"done": [], "not_done": [], "unknown": []})
+        for key, text, milestone_id in milestone_entries(employee):
+            verdict = known.get(key)
+            bucket = "unknown" if verdict is None else "done" if verdict == "YES" else "not_done"
+            result[bucket].append({"id": milestone_id, "name": text})
+    return results
+
+def complete_batch(results, mode="browser", headless=True):
+    """Completes each employee's "done" milestones and prints a summary per employee."""
+    pool = BrowserSessionPool(headless=headless) if mode == "browser" else None
+    try:
+        for employee_email, result in results.items():
+            print(Fore.CYAN + Style.BRIGHT + f"\n== {employee_email} ==")
+            for ms in result["done"]:
+                print(Fore.GREEN + Style.BRIGHT + "AI -> YES:", ms["name"])
+            if result["done"]:
+                if pool is None:
+                    complete_milestones_via_api(result["done"], employee_email)
+                else:
+                    pool.complete_milestones(employee_email, [ms["name"] for ms in result["done"]])
+                    # One employee at a time, so only one browser is open.
+                    pool.discard(employee_email)
+            for ms in result["not_done"]:
+                print(Fore.YELLOW + " - NOT completed:", ms["name"])
+            for ms in result["unknown"]:
+                print(Fore.RED + " - no answer from AI:", ms["name"])
+    finally:
+        if pool is not None:
+            pool.close()
+
+MILESTONES_LINK = "//span[normalize-space(text())='My Milestones']"
+MILESTONE_ITEMS = "//li[.//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), 'complete')]]"
+COMPLETE_BUTTON = ".//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), 'complete')]"
+
+def new_chrome(headless=True):
     chrome_options = Options()
     chrome_options.add_argument("--remote-allow-origins=*")
+    if headless:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1920,1080")
     chrome_options.add_experimental_option("prefs", {
         "credentials_enable_service": False,
         "profile.password_manager_enabled": False
     })
     driver = webdriver.Chrome(options=chrome_options)
-    wait = WebDriverWait(driver, 15)
-
-    try:
+    if not headless:
         driver.maximize_window()
+    return driver
+
+class MilestoneSession:
+    """One logged-in browser for one employee, kept on the My Milestones page."""
+
+    def __init__(self, driver, employee_email, app_url=APP_URL):
+        self.driver = driver
+        self.employee_email = employee_email
+        self.wait = WebDriverWait(driver, WAIT_SECONDS)
 
         # 1) Log in
-        driver.get("http://localhost:3000")
-        wait.until(EC.presence_of_element_located((By.NAME, "email"))).send_keys(employee_email)
+        driver.get(app_url)
+        self.wait.until(EC.presence_of_element_located((By.NAME, "email"))).send_keys(employee_email)
         driver.find_element(By.NAME, "password").send_keys(employee_email.split('@')[0])
         driver.find_element(By.XPATH, "//button[@type='submit']").click()
 
         # 2) Click "My Milestones" in the sidebar
-        milestones_btn = wait.until(EC.element_to_be_clickable((
-            By.XPATH,
-            "//span[normalize-space(text())='My Milestones']"
-        )))
+        milestones_btn = self.wait.until(EC.element_to_be_clickable((By.XPATH, MILESTONES_LINK)))
         driver.execute_script("arguments[0].click();", milestones_btn)
-        time.sleep(2)  # let the page render
 
-        # 3) Find the milestone and complete it
-        items = driver.find_elements(By.XPATH, "//li")
+    def _items(self):
+        """The milestone rows, once the list has rendered (empty if it never does)."""
+        try:
+            return WebDriverWait(self.driver, LIST_WAIT_SECONDS).until(
+                EC.presence_of_all_elements_located((By.XPATH, MILESTONE_ITEMS))
+            )
+        except TimeoutException:
+            return []
+
+    def complete(self, milestone_name):
+        """Clicks Complete on the first row mentioning milestone_name. Returns True on success."""
         target = None
-        for li in items:
+        for li in self._items():
             if milestone_name.lower() in li.text.lower():
                 target = li
                 break
-
         if not target:
             print(Fore.RED + Style.BRIGHT + f"[ERROR] Could not find milestone: {milestone_name}")
-            return
+            return False
 
-        complete_btn = target.find_element(
-            By.XPATH,
-            ".//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), 'complete')]"
-        )
-        driver.execute_script("arguments[0].click();", complete_btn)
+        complete_btn = target.find_element(By.XPATH, COMPLETE_BUTTON)
+        self.driver.execute_script("arguments[0].click();", complete_btn)
+        # The page drops the row once the backend has logged the completion.
+        self.wait.until(EC.staleness_of(target))
         print(Fore.GREEN + Style.BRIGHT + f"[DONE] '{milestone_name}' marked complete.")
+        return True
 
-    except Exception as e:
-        print(Fore.RED + Style.BRIGHT + f"[ERROR] Selenium error for '{milestone_name}': {e}")
-    finally:
-        driver.quit()
+class BrowserSessionPool:
+    """
+    Logged-in browser sessions, one per employee, reused for every milestone that
+    employee completes while the pool is open. Use as a context manager so every
+    browser is quit at the end.
+    """
+
+    def __init__(self, headless=True, app_url=APP_URL, driver_factory=new_chrome):
+        self.headless = headless
+        self.app_url = app_url
+        self.driver_factory = driver_factory
+        self._sessions = {}
+
+    def session(self, employee_email):
+        session = self._sessions.get(employee_email)
+        if session is None:
+            driver = self.driver_factory(self.headless)
+            try:
+                session = MilestoneSession(driver, employee_email, self.app_url)
+            except Exception:
+                driver.quit()
+                raise
+            self._sessions[employee_email] = session
+        return session
+
+    def complete_milestones(self, employee_email, milestone_names):
+        """Completes each milestone in one page session. Returns the names completed."""
+        done = []
+        try:
+            session = self.session(employee_email)
+            for name in milestone_names:
+                if session.complete(name):
+                    done.append(name)
+        except WebDriverException as e:
+            print(Fore.RED + Style.BRIGHT + f"[ERROR] Selenium error for {employee_email}: {e}")
+            self.discard(employee_email)
+        return done
+
+    def discard(self, employee_email):
+        session = self._sessions.pop(employee_email, None)
+        if session is not None:
+            session.driver.quit()
+
+    def close(self):
+        for employee_email in list(self._sessions):
+            self.discard(employee_email)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def mark_specific_milestone_completed(milestone_name, employee_email, headless=True):
+    """
+    Uses Selenium to log in, navigate to My Milestones in your React sidebar,
+    and click the Complete button for the given milestone_name.
+    """
+    with BrowserSessionPool(headless=headless) as pool:
+        return bool(pool.complete_milestones(employee_email, [milestone_name]))
+
+def complete_milestones_via_api(milestones, employee_email, api_url=API_URL):
+    """
+    Completes the milestones with one POST to the backend, without a browser.
+    Milestones are names or {"id", "name"} items; those with an id are matched
+    on it exactly, the rest by name. Returns the names completed.
+    """
+    milestone_ids, milestone_names = [], []
+    for item in milestones:
+        if isinstance(item, dict) and item.get("id") is not None:
+            milestone_ids.append(item["id"])
+        else:
+            milestone_names.append(item["name"] if isinstance(item, dict) else item)
+    try:
+        response = requests.post(
+            f"{api_url}/api/log-milestones/batch",
+            json={"employee_email": employee_email, "milestone_ids": milestone_ids,
+                  "milestone_names": milestone_names},
+            timeout=60,
+        )
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(Fore.RED + Style.BRIGHT + f"[ERROR] Batch completion failed: {e}")
+        return []
+
+    result = response.json()
+    done = []
+    for item in result.get("completed", []):
+        if item.get("status") == 200:
+            done.append(item["name"])
+            print(Fore.GREEN + Style.BRIGHT + f"[DONE] '{item['name']}' marked complete.")
+        else:
+            print(Fore.RED + Style.BRIGHT + f"[ERROR] '{item['name']}': {item.get('result')}")
+    for missing in result.get("not_found", []):
+        print(Fore.RED + Style.BRIGHT + f"[ERROR] Could not find milestone: {missing}")
+    return done
 
 def main():
-    if len(sys.argv) != 4:
-        print(Fore.RED + Style.BRIGHT + "Usage: python ai_agent.py <path_or_dir> <domain> <employee_email>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Check milestones with the AI and complete the finished ones.")
+    parser.add_argument("path_or_dir", nargs="?")
+    parser.add_argument("domain", nargs="?")
+    parser.add_argument("employee_email", nargs="?")
+    parser.add_argument("--batch", metavar="FILE",
+                        help='check employees\' milestones from a JSON payload file, or "-" to read it from stdin')
+    parser.add_argument("--scan", action="store_true",
+                        help="read milestones from the newest 3 matching files in the directory of path_or_dir")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY,
+                        help="LLM requests in flight at once in batch mode")
+    parser.add_argument("--recheck", action="store_true",
+                        help="ask the LLM again about every milestone, ignoring stored verdicts")
+    parser.add_argument("--mode", choices=("browser", "api"), default=os.getenv("AI_AGENT_MODE", "browser"),
+                        help="complete milestones through the UI or with one batch API call")
+    parser.add_argument("--show-browser", action="store_true", help="run Chrome with a visible window")
+    args = parser.parse_args()
 
-    path_or_dir, domain, employee_email = sys.argv[1], sys.argv[2], sys.argv[3]
+    if args.batch:
+        results = run_batch(load_batch(args.batch), concurrency=args.concurrency, recheck=args.recheck)
+        complete_batch(results, mode=args.mode, headless=not args.show_browser)
+        return
+    if not (args.path_or_dir and args.domain and args.employee_email):
+        parser.error("path_or_dir, domain and employee_email are required unless --batch is given")
 
-    if os.path.isdir(path_or_dir):
-        dir_to_scan = path_or_dir
-    elif os.path.isfile(path_or_dir):
-        dir_to_scan = os.path.dirname(path_or_dir) or '.'
+    path_or_dir, domain, employee_email = args.path_or_dir, args.domain, args.employee_email
+
+    if os.path.isfile(path_or_dir) and not args.scan:
+        # Only the file we were given; no directory scan.
+        last_three = [path_or_dir]
+    elif os.path.isdir(path_or_dir) or os.path.isfile(path_or_dir):
+        if not args.scan:
+            parser.error(f"'{path_or_dir}' is a directory; pass --scan to read its newest files")
+        dir_to_scan = path_or_dir if os.path.isdir(path_or_dir) else (os.path.dirname(path_or_dir) or '.')
+        patterns = ["*.txt", "*.html", "*.js", "*.css", "*.py"]
+        last_three = get_last_n_files(dir_to_scan, patterns, n=3)
+        if not last_three:
+            print(Fore.RED + Style.BRIGHT + f"[ERROR] No files matching {patterns} in {dir_to_scan}")
+            sys.exit(1)
     else:
         print(Fore.RED + Style.BRIGHT + f"[ERROR] '{path_or_dir}' is not a valid path.")
         sys.exit(1)
 
-    patterns = ["*.txt", "*.html", "*.js", "*.css", "*.py"]
-    last_three = get_last_n_files(dir_to_scan, patterns, n=3)
-    if not last_three:
-        print(Fore.RED + Style.BRIGHT + f"[ERROR] No files matching {patterns} in {dir_to_scan}")
-        sys.exit(1)
-
     print(Fore.CYAN + "Checking these files (newest first):")
     for fp in last_three:
         print(Fore.CYAN + " -", fp)
@@ -158,34 +522,9 @@ def main():
         print(Fore.YELLOW + "[INFO] No milestones found.")
         sys.exit(0)
 
-    aggregated = "\n".join(all_milestones)
-    try:
-        raw = check_milestones_from_text(aggregated, domain, model="gpt-4")
-    except RateLimitError:
-        print(Fore.YELLOW + "[WARN] GPT-4 limit hit, retrying with gpt-3.5-turbo")
-        raw = check_milestones_from_text(aggregated, domain, model="gpt-3.5-turbo")
-
-    try:
-        milestone_status = json.loads(raw)
-    except Exception as e:
-        print(Fore.RED + Style.BRIGHT + f"[ERROR] Could not parse JSON from AI: {e}")
-        print(Fore.RED + "Raw AI response:", raw)
-        sys.exit(1)
-
-    not_done = []
-    for ms, stat in milestone_status.items():
-        if stat.strip().upper() == "YES":
-            print(Fore.GREEN + Style.BRIGHT + "AI -> YES:", ms)
-            mark_specific_milestone_completed(ms, employee_email)
-        else:
-            not_done.append(ms)
-
-    if not_done:
-        print(Fore.YELLOW + Style.BRIGHT + "\nMilestones NOT completed:")
-        for m in not_done:
-            print(Fore.YELLOW + " -", m)
-    else:
-        print(Fore.GREEN + Style.BRIGHT + "\nAll detected milestones were marked completed.")
+    employee = {"employee_email": employee_email, "domain": domain, "milestones": all_milestones}
+    results = run_batch([employee], recheck=args.recheck)
+    complete_batch(results, mode=args.mode, headless=not args.show_browser)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,101 @@
+"""
+Milestone verification for a whole project: one ai_agent run (and one LLM call)
+per employee, as /api/ai-check-all-new does, against ai_agent's batch mode, using
+the mock OpenAI server.
+
+The mock answers YES for milestones whose number is even, so the script also
+checks that every employee gets the right verdicts back. The batch is then rerun
+unchanged, and with new milestones in one domain, where the verdict store should
+limit the LLM to the new milestones.
+
+    python benchmarks/bench_ai_batch.py --employees 40 --milestones 25 --distinct 120
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import openai
+
+import ai_agent
+import llm_cache
+from mock_openai_server import start_mock_server
+
+
+def verdict_responder(request):
+    prompt = request["messages"][-1]["content"]
+    block = prompt.split("Return strictly JSON:", 1)[1].split("Example:", 1)[0]
+    names = [line.strip() for line in block.splitlines() if line.strip()]
+    return json.dumps({name: "YES" if int(name.rsplit(" ", 1)[1]) % 2 == 0 else "NO" for name in names})
+
+
+def make_employees(n, per_employee, distinct, domains):
+    rng = random.Random(0)
+    return [{
+        "employee_email": f"dev{i}@example.com",
+        "domain": f"Domain {i % domains}",
+        "milestones": [f"Milestone {rng.randrange(distinct)}" for _ in range(per_employee)],
+    } for i in range(n)]
+
+
+def expected_done(employees):
+    return {e["employee_email"]: sorted(m for m in set(e["milestones"]) if int(m.rsplit(" ", 1)[1]) % 2 == 0)
+            for e in employees}
+
+
+def legacy(employees):
+    """One check_milestones_from_text call per employee, one after another."""
+    results = {}
+    for employee in employees:
+        raw = ai_agent.check_milestones_from_text("\n".join(employee["milestones"]), employee["domain"])
+        answer = json.loads(raw)
+        results[employee["employee_email"]] = sorted(k for k, v in answer.items() if v == "YES")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--employees", type=int, default=40)
+    parser.add_argument("--milestones", type=int, default=25, help="milestones per employee")
+    parser.add_argument("--distinct", type=int, default=120, help="distinct milestone texts")
+    parser.add_argument("--domains", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=1.0)
+    args = parser.parse_args()
+
+    server = start_mock_server(verdict_responder, latency=args.latency, token_delay=0.0005)
+    openai.api_base = server.base_url
+    openai.api_key = "mock"
+    employees = make_employees(args.employees, args.milestones, args.distinct, args.domains)
+
+    llm_cache._default_cache = llm_cache.LLMCache(path=None)
+    server.stats.update(requests=0)
+    start = time.perf_counter()
+    got = legacy(employees)
+    print(f"per employee   {time.perf_counter() - start:6.2f} s  LLM requests {server.stats['requests']:>4}  "
+          f"{'correct' if got == expected_done(employees) else 'WRONG'}")
+
+    # Reruns share one verdict store: unchanged, then with a new milestone for
+    # every employee in the first domain.
+    store = ai_agent.VerdictStore(path=None)
+    changed = [dict(e, milestones=e["milestones"] + ([f"Milestone {args.distinct + i}"]
+                                                     if i % args.domains == 0 else []))
+               for i, e in enumerate(employees)]
+    for label, batch in (("batch mode", employees), ("rerun, same", employees), ("rerun, +new", changed)):
+        llm_cache._default_cache = llm_cache.LLMCache(path=None)
+        server.stats.update(requests=0)
+        start = time.perf_counter()
+        results = ai_agent.run_batch(batch, store=store)
+        elapsed = time.perf_counter() - start
+        got = {email: sorted(ms["name"] for ms in r["done"]) for email, r in results.items()}
+        unknown = sum(len(r["unknown"]) for r in results.values())
+        print(f"{label:<14} {elapsed:6.2f} s  LLM requests {server.stats['requests']:>4}  "
+              f"{'correct' if got == expected_done(batch) and not unknown else 'WRONG'}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Query count and latency of the assigner's candidate lookups on a seeded SQLite DB.
+
+Compares the old NOT IN (SELECT ... FROM assignments) queries, before and after
+db_migrations.add_assignment_indexes, with the indexed NOT EXISTS single-round-trip
+fetch. (Correlated NOT EXISTS without the indexes is a nested scan, which is why
+the migration ships alongside the rewrite.)
+
+    python benchmarks/bench_assignment_queries.py --assignments 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+
+import task_assigner
+from db_migrations import ASSIGNMENT_INDEXES, add_assignment_indexes
+from task_assigner import (Assignment, Base, EmployeeDetails, Project, ProjectAssignment, SubTask,
+                           Task)
+
+PROJECT_ID = 1
+
+
+def seed(engine, n_assignments, n_employees, project_subtasks, rng):
+    n_subtasks = n_assignments + project_subtasks
+    with engine.begin() as conn:
+        conn.execute(insert(Project), [{"project_id": p, "project_name": f"p{p}"} for p in (1, 2)])
+        conn.execute(insert(EmployeeDetails), [
+            {"employee_id": i, "email": f"e{i}@x", "skills": "python,sql", "domains": "backend"}
+            for i in range(1, n_employees + 1)
+        ])
+        conn.execute(insert(Task), [{"id": 1, "name": "t1", "project_id": 1},
+                                    {"id": 2, "name": "t2", "project_id": 2}])
+        conn.execute(insert(SubTask), [
+            {"id": i, "name": f"Build python api {i}", "task_id": 1 if i <= project_subtasks else 2}
+            for i in range(1, n_subtasks + 1)
+        ])
+        busy = n_employees // 2
+        conn.execute(insert(Assignment), [
+            {"subtask_id": project_subtasks + i, "employee_id": rng.randint(1, busy)}
+            for i in range(1, n_assignments + 1)
+        ])
+        conn.execute(insert(ProjectAssignment), [
+            {"employee_id": e, "project_id": PROJECT_ID}
+            for e in rng.sample(range(1, n_employees + 1), n_employees // 10)
+        ])
+
+
+def old_fetch(session):
+    """The three NOT IN queries assign_employees_to_subtasks used to run."""
+    project_employees = session.query(EmployeeDetails).join(ProjectAssignment).filter(
+        ProjectAssignment.project_id == PROJECT_ID,
+        ~EmployeeDetails.employee_id.in_(session.query(Assignment.employee_id))
+    ).all()
+    extra = session.query(EmployeeDetails).filter(
+        ~EmployeeDetails.employee_id.in_(session.query(ProjectAssignment.employee_id)),
+        ~EmployeeDetails.employee_id.in_(session.query(Assignment.employee_id))
+    ).all()
+    subtasks = session.query(SubTask).join(Task, SubTask.task_id == Task.id).filter(
+        Task.project_id == PROJECT_ID,
+        ~SubTask.id.in_(session.query(Assignment.subtask_id))
+    ).all()
+    return len(project_employees), len(subtasks)
+
+
+def new_fetch(session):
+    project_employees, _, subtasks = task_assigner.fetch_assignment_candidates(PROJECT_ID)
+    return len(project_employees), len(subtasks)
+
+
+def measure(label, fn, Session, counter, repeat):
+    timings = []
+    for _ in range(repeat):
+        session = Session()
+        task_assigner.session = session
+        counter["n"] = 0
+        start = time.perf_counter()
+        result = fn(session)
+        timings.append(time.perf_counter() - start)
+        session.close()
+    print(f"{label:<26} {counter['n']} queries  best {min(timings) * 1000:8.1f} ms  "
+          f"(project employees, open subtasks) = {result}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--assignments", type=int, default=100_000)
+    parser.add_argument("--employees", type=int, default=20_000)
+    parser.add_argument("--project-subtasks", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            for _, name, _ in ASSIGNMENT_INDEXES:
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        seed(engine, args.assignments, args.employees, args.project_subtasks, random.Random(0))
+
+        counter = {"n": 0}
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count(*_):
+            counter["n"] += 1
+
+        Session = sessionmaker(bind=engine)
+        expected = measure("NOT IN, no indexes", old_fetch, Session, counter, args.repeat)
+        add_assignment_indexes(engine)
+        measure("NOT IN, indexed", old_fetch, Session, counter, args.repeat)
+        got = measure("NOT EXISTS, indexed", new_fetch, Session, counter, args.repeat)
+        engine.dispose()
+    if expected != got:
+        sys.exit("MISMATCH between old and new candidate queries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Load test of the task preview endpoint: model_tasks (Flask behind a fixed pool
+of WSGI threads, like a threaded production WSGI server) against
+model_tasks_async (aiohttp, --workers processes), both talking to the local
+mock OpenAI server (see mock_openai_server.py) and a SQLite project row.
+
+Every request carries a distinct feedback string, so none is answered from the
+LLM cache. Reports throughput, latency percentiles, errors and how many
+completions the mock saw in flight at once.
+
+    python benchmarks/bench_async_preview.py --requests 600 --concurrency 300 --latency 2
+    python benchmarks/bench_async_preview.py --endpoint stream --token-delay 0.002
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+import aiohttp
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, ROOT)
+
+from mock_openai_server import start_mock_server  # noqa: E402
+
+PATHS = {"preview": "/api/generate-tasks-preview", "stream": "/api/generate-tasks-preview/stream"}
+
+
+class PooledWSGIServer(WSGIServer):
+    """WSGI server that handles requests on a fixed number of threads."""
+    request_queue_size = 1024
+
+    def __init__(self, address, threads):
+        super().__init__(address, QuietHandler)
+        self.executor = ThreadPoolExecutor(threads)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def serve_wsgi(port, threads):
+    import model_tasks
+
+    server = PooledWSGIServer(("127.0.0.1", port), threads)
+    server.set_app(model_tasks.app)
+    server.serve_forever()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(port, proc, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with {proc.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def seed_project(database_url):
+    os.environ["DATABASE_URL"] = database_url
+    import model_tasks
+
+    model_tasks.Base.metadata.create_all(model_tasks.engine)
+    model_tasks.session.add(model_tasks.Project(project_id=1, project_name="Bench",
+                                                project_description="A web shop."))
+    model_tasks.session.commit()
+    model_tasks.session.remove()
+    model_tasks.engine.dispose()
+
+
+async def load(port, path, requests, concurrency, label):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], []
+    timeout = aiohttp.ClientTimeout(total=600)
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0), timeout=timeout) as client:
+        async def one(i):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    params = {"project_id": "1", "feedback": f"{label} request {i}"}
+                    async with client.get(f"http://127.0.0.1:{port}{path}", params=params) as response:
+                        body = await response.text()
+                    if response.status != 200 or '"error"' in body or ('"tasks"' not in body):
+                        errors.append(f"{response.status} {body[:120]}")
+                    else:
+                        latencies.append(time.perf_counter() - start)
+                except Exception as e:
+                    errors.append(type(e).__name__)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        return time.perf_counter() - start, latencies, errors
+
+
+def run(label, command, port, env, args, mock):
+    proc = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL)
+    try:
+        wait_until_up(port, proc)
+        mock.stats.update(requests=0, max_in_flight=0)
+        elapsed, latencies, errors = asyncio.run(
+            load(port, PATHS[args.endpoint], args.requests, args.concurrency, label))
+    finally:
+        proc.terminate()
+        proc.wait(10)
+    q = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [float("nan")] * 99
+    print(f"{label:<24} {len(latencies) / elapsed:7.1f} req/s  p50 {q[49]:6.2f} s  p95 {q[94]:6.2f} s  "
+          f"errors {len(errors):4d}  LLM calls in flight (max) {mock.stats['max_in_flight']:4d}")
+    if errors:
+        print(f"{'':<24} first error: {errors[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=2.0, help="mock seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.0)
+    parser.add_argument("--endpoint", choices=sorted(PATHS), default="preview")
+    parser.add_argument("--wsgi-threads", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1, help="model_tasks_async worker processes")
+    parser.add_argument("--serve-wsgi", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_wsgi:
+        serve_wsgi(args.serve_wsgi, args.wsgi_threads)
+        return
+
+    mock = start_mock_server(latency=args.latency, token_delay=args.token_delay)
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        seed_project(database_url)
+        env = dict(os.environ, DATABASE_URL=database_url, OPENAI_API_BASE=mock.base_url,
+                   OPENAI_API_KEY="mock", LLM_CACHE_PATH="")
+        print(f"{args.requests} {args.endpoint} requests, {args.concurrency} concurrent, "
+              f"mock LLM latency {args.latency}s")
+
+        port = free_port()
+        run(f"flask, {args.wsgi_threads} threads",
+            [sys.executable, os.path.abspath(__file__), "--serve-wsgi", str(port),
+             "--wsgi-threads", str(args.wsgi_threads)], port, env, args, mock)
+
+        port = free_port()
+        run(f"async, {args.workers} worker(s)",
+            [sys.executable, "model_tasks_async.py", "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(args.workers)], port, env, args, mock)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Compares the old per-row commit loop against task_persistence.persist_task_tree.
+
+Both paths write the same generated plan into a file-backed SQLite database
+(so commits pay for an fsync, like MySQL does) and report rows/sec.
+
+    python benchmarks/bench_bulk_persist.py --categories 10 --repeat 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from task_generator import Base, Task, Subtask, Milestone, Project
+from task_persistence import persist_task_tree
+
+
+def make_plan(categories, tasks_per_category=3, subtasks_per_task=3):
+    return {
+        "tasks": [
+            {
+                "category": f"Category {c}",
+                "tasks": [
+                    {
+                        "task": f"Task {c}.{t}",
+                        "subtasks": [
+                            {
+                                "name": f"Subtask {c}.{t}.{s}",
+                                "milestones": [{"name": f"Milestone {c}.{t}.{s}.{m}"} for m in range(5)],
+                            }
+                            for s in range(subtasks_per_task)
+                        ],
+                    }
+                    for t in range(tasks_per_category)
+                ],
+            }
+            for c in range(categories)
+        ]
+    }
+
+
+def legacy_persist(session, tasks_preview, project_id):
+    """The insert loop task_generator/model_tasks used before the bulk path."""
+    for category in tasks_preview.get("tasks", []):
+        for task_data in category.get("tasks", []):
+            task = Task(name=task_data.get("task", "Unnamed Task"), project_id=project_id)
+            session.add(task)
+            session.commit()
+            for subtask_data in task_data.get("subtasks") or []:
+                subtask = Subtask(name=subtask_data.get("name", "Unnamed Subtask"), task_id=task.id)
+                session.add(subtask)
+                session.commit()
+                for milestone_data in subtask_data.get("milestones") or []:
+                    session.add(Milestone(name=milestone_data.get("name", "Unnamed Milestone"),
+                                          subtask_id=subtask.id))
+                session.commit()
+
+
+def count_rows(plan):
+    tasks = [t for c in plan["tasks"] for t in c["tasks"]]
+    subtasks = [s for t in tasks for s in t["subtasks"]]
+    return len(tasks) + len(subtasks) + sum(len(s["milestones"]) for s in subtasks)
+
+
+def run(label, persist, plan, repeat):
+    rows = count_rows(plan)
+    timings = []
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        for i in range(repeat):
+            session = Session()
+            session.add(Project(project_id=i + 1, project_name=f"p{i}", project_description="bench"))
+            session.commit()
+            start = time.perf_counter()
+            persist(session, plan, i + 1)
+            timings.append(time.perf_counter() - start)
+            session.close()
+        engine.dispose()
+    best = min(timings)
+    print(f"{label:<10} {rows:>6} rows  best {best * 1000:8.1f} ms  {rows / best:10.0f} rows/sec")
+    return rows / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    plan = make_plan(args.categories)
+    legacy = run("per-row", legacy_persist, plan, args.repeat)
+    bulk = run("bulk", lambda s, p, pid: persist_task_tree(s, Task, Subtask, Milestone, p, pid),
+               plan, args.repeat)
+    print(f"speedup: {bulk / legacy:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
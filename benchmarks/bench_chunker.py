@@ -0,0 +1,67 @@
+"""
+API calls and tokens per documentation run: the fixed 2000-character chunker
+against the token- and definition-aware one, over a source tree (default: this
+repository).
+
+"prompt tokens" counts system prompt + user prompt + code for every call;
+"completion budget" is calls x max_tokens. "mid-line cuts" counts chunk
+boundaries that fall inside a line of code.
+
+    python benchmarks/bench_chunker.py [path] --context 4096 8192 16385
+"""
+import argparse
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+
+import documentation_agent as da
+import llm_cache
+
+LEGACY_MAX_CHARS = 2000
+LEGACY_MAX_TOKENS = 400
+
+
+def legacy_file_chunks(rel, path):
+    """The previous iter_file_chunks: fixed character slices of the fenced file."""
+    text = "".join(da.iter_text_blocks(path))
+    snippet = f"\n\n# File: {rel}\n```text\n{text}\n```"
+    return [snippet[i:i + LEGACY_MAX_CHARS] for i in range(0, len(snippet), LEGACY_MAX_CHARS)]
+
+
+def measure(files, chunker):
+    calls = prompt_tokens = cuts = 0
+    overhead = da.count_tokens(da.SYSTEM_PROMPT_EXTEND) + da.count_tokens(da.USER_PROMPT)
+    for rel, path in files:
+        chunks = chunker(rel, path)
+        calls += len(chunks)
+        prompt_tokens += sum(overhead + da.count_tokens(chunk) for chunk in chunks)
+        cuts += sum(1 for chunk in chunks[:-1] if not chunk.endswith(("\n", "\n```")))
+    return calls, prompt_tokens, cuts
+
+
+def report(label, calls, prompt_tokens, cuts, max_tokens, baseline_calls=None):
+    saved = f"  calls saved {baseline_calls - calls:>5} ({1 - calls / baseline_calls:.0%})" if baseline_calls else ""
+    print(f"{label:<22} calls {calls:>5}  prompt tokens {prompt_tokens:>8}  "
+          f"completion budget {calls * max_tokens:>8}  mid-line cuts {cuts:>4}{saved}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", nargs="?", default=os.path.join(HERE, ".."))
+    parser.add_argument("--context", type=int, nargs="+", default=[4096, 8192, 16385])
+    args = parser.parse_args()
+
+    encoding = llm_cache.get_encoding(da.DOC_MODEL)
+    files = [(rel, path) for rel, path in da.iter_source_files(args.path) if da.file_hash(path)]
+    print(f"{len(files)} files; tokenizer: {encoding.name if encoding else 'character estimate'}")
+    baseline = measure(files, legacy_file_chunks)
+    report(f"fixed {LEGACY_MAX_CHARS} chars", *baseline, LEGACY_MAX_TOKENS)
+    for context in args.context:
+        result = measure(files, lambda rel, path: list(da.iter_file_chunks(rel, path, context)))
+        report(f"aware, context {context}", *result, da.MAX_COMPLETION_TOKENS, baseline[0])
+
+
+if __name__ == "__main__":
+    main()
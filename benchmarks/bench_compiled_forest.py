@@ -0,0 +1,89 @@
+"""
+sklearn RandomForestRegressor.predict against compiled_forest on a forest shaped
+like the one model_step1 trains (100 trees, the four employee features).
+
+The committed employee_performance_model.pkl was fitted on an empty table (every
+tree is a single leaf), so a forest is trained here on synthetic rows instead.
+Reports load time, per-call latency at several batch sizes, and whether the
+predictions are bit-identical.
+
+    python benchmarks/bench_compiled_forest.py --rows 5000 --trees 100
+"""
+import argparse
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from compiled_forest import export_forest, load_forest  # noqa: E402
+
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+
+def synthetic_features(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    total = rng.integers(0, 40, rows)
+    completed = np.minimum((rng.random(rows) * (total + 1)).astype(int), total)
+    feedback = rng.integers(0, 10, rows)
+    ratio = np.where(total > 0, completed / np.maximum(total, 1) * 100, 0)
+    X = pd.DataFrame({"total_assignments": total, "completed_assignments": completed,
+                      "completion_ratio": ratio, "feedback_count": feedback})
+    return X, ratio + feedback + rng.normal(0, 5, rows)
+
+
+def per_call(fn, X, seconds=1.0):
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn(X)
+        calls += 1
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000, help="training rows")
+    parser.add_argument("--trees", type=int, default=100)
+    args = parser.parse_args()
+
+    X, y = synthetic_features(args.rows)
+    model = RandomForestRegressor(n_estimators=args.trees, random_state=42).fit(X, y)
+    workdir = tempfile.mkdtemp()
+    pickle_path = os.path.join(workdir, "model.pkl")
+    with open(pickle_path, "wb") as f:
+        pickle.dump(model, f)
+    forest_dir = export_forest(model, os.path.join(workdir, "model.forest"))
+
+    start = time.perf_counter()
+    with open(pickle_path, "rb") as f:
+        pickle.load(f)
+    pickle_load = time.perf_counter() - start
+    start = time.perf_counter()
+    forest = load_forest(forest_dir)
+    forest_load = time.perf_counter() - start
+    print(f"{args.trees} trees, {forest.value.shape[0]} nodes, depth {forest.max_depth}")
+    print(f"load: pickle {pickle_load * 1000:.1f} ms, compiled (mmap) {forest_load * 1000:.2f} ms")
+
+    test, _ = synthetic_features(10000, seed=1)
+    identical = np.array_equal(model.predict(test), forest.predict(test))
+    print(f"predictions identical on {len(test)} rows: {identical}")
+
+    for batch in (1, 100, 10000):
+        matrix = test.values[:batch]
+        before = per_call(model.predict, matrix)
+        after = per_call(forest.predict, matrix)
+        print(f"batch {batch:>5}: sklearn {before * 1000:8.2f} ms  compiled {after * 1000:8.2f} ms  "
+              f"{before / after:5.1f}x")
+    shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
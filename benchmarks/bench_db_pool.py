@@ -0,0 +1,110 @@
+"""
+Concurrent request-style DB access through db.py against the old pattern of one
+module-global Session shared by every Flask thread.
+
+--threads threads each run --requests "requests": an indexed lookup, a short
+sleep standing in for the rest of the handler, an insert and a commit, then
+release the session. Sharing one Session between threads is not supported by
+SQLAlchemy; the errors column shows what that costs.
+
+Runs against a SQLite file, so it needs no MySQL; reports req/s, errors and
+db.pool_stats() (checkouts, connections opened, time spent waiting for the pool).
+
+    python benchmarks/bench_db_pool.py --threads 16 --requests 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sqlalchemy import Column, Integer, String, select
+from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
+
+import db
+
+Base = declarative_base()
+
+
+class Project(Base):
+    __tablename__ = "projects"
+    project_id = Column(Integer, primary_key=True)
+    project_name = Column(String(100))
+
+
+class Visit(Base):
+    __tablename__ = "visits"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    project_id = Column(Integer)
+
+
+def run(label, threads, requests, session_for, release, work_seconds):
+    errors, lock = [], threading.Lock()
+
+    def client(seed):
+        for i in range(requests):
+            try:
+                session = session_for()
+                project_id = (seed * requests + i) % 500 + 1
+                session.execute(select(Project).where(Project.project_id == project_id)).first()
+                time.sleep(work_seconds)
+                session.add(Visit(project_id=project_id))
+                session.commit()
+            except Exception as e:
+                with lock:
+                    errors.append(type(e).__name__)
+                try:
+                    session.rollback()
+                except Exception:
+                    pass
+            finally:
+                release()
+
+    workers = [threading.Thread(target=client, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    kinds = sorted(set(errors))
+    print(f"{label:<30} {threads * requests / elapsed:8.0f} req/s  errors {len(errors):5d} {kinds[:2]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--work-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    work = args.work_ms / 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        setup = db.create_engine(url)
+        Base.metadata.create_all(setup)
+        with setup.begin() as conn:
+            conn.execute(Project.__table__.insert(), [{"project_id": i, "project_name": f"p{i}"}
+                                                      for i in range(1, 501)])
+        setup.dispose()
+
+        # Old pattern: Session() created once at import and shared by all threads.
+        shared = sessionmaker(bind=db.create_engine(url))()
+        run("shared global session", args.threads, args.requests, lambda: shared, lambda: None, work)
+
+        for pool_size, overflow in ((2, 0), (db.POOL_SIZE, db.MAX_OVERFLOW)):
+            engine = db.create_engine(url, pool_size=pool_size, max_overflow=overflow)
+            Session = scoped_session(sessionmaker(bind=engine))
+            run(f"scoped, pool {pool_size}+{overflow}", args.threads, args.requests, Session, Session.remove, work)
+            stats = db.pool_stats(engine)
+            print(f"{'':<30} checkouts {stats['checkouts']}, connects {stats['connects']}, "
+                  f"waited {stats['waits']}x, avg wait {stats['avg_wait_ms']:.2f} ms, "
+                  f"max wait {stats['max_wait_seconds'] * 1000:.1f} ms")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Source collection for documentation_agent on a synthetic tree: the old
+read-everything collector against the streaming scandir/chunk pipeline.
+
+Each mode runs in its own interpreter so peak RSS is measured cleanly. The tree
+holds --files documented source files plus a node_modules directory of the same
+size, which the old collector walked in full before discarding.
+
+    python benchmarks/bench_doc_collector.py --files 50000 --file-kb 4
+"""
+import argparse
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+
+
+def make_tree(root, files, file_kb):
+    rng = random.Random(0)
+    line = "def handler(request):  # " + "x" * 40 + "\n"
+    body = line * max(1, file_kb * 1024 // len(line))
+    for base in ("src", os.path.join("node_modules", "dep")):
+        for i in range(files):
+            directory = os.path.join(root, base, f"pkg{i // 500}", f"mod{i // 50 % 10}")
+            os.makedirs(directory, exist_ok=True)
+            ext = rng.choice((".py", ".js", ".ts"))
+            with open(os.path.join(directory, f"file{i}{ext}"), "w", encoding="utf-8") as f:
+                f.write(body)
+
+
+def legacy_chunks(base_dir, max_chars=2000):
+    """The old collect_file_snippets + chunk_snippets."""
+    skip_dirs = {"node_modules", ".git", "__pycache__"}
+    exts = (".py", ".js", ".jsx", ".ts", ".tsx", ".html", ".css")
+    snippets = []
+    for root, dirs, files in os.walk(base_dir):
+        if any(sd in root for sd in skip_dirs):
+            continue
+        for fn in files:
+            if fn.endswith(exts):
+                path = os.path.join(root, fn)
+                text = open(path, encoding="utf-8").read()
+                snippets.append(f"\n\n# File: {os.path.relpath(path, base_dir)}\n```text\n{text}\n```")
+    chunks, current = [], ""
+    for snip in snippets:
+        if len(snip) > max_chars:
+            for i in range(0, len(snip), max_chars):
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks.append(snip[i:i + max_chars])
+        elif current and len(current) + len(snip) > max_chars:
+            chunks.append(current)
+            current = snip
+        else:
+            current += snip
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def streaming_chunks(base_dir):
+    import documentation_agent
+    for rel, path in documentation_agent.iter_source_files(base_dir):
+        documentation_agent.file_hash(path)
+        yield from documentation_agent.iter_file_chunks(rel, path)
+
+
+def run_mode(mode, root):
+    start = time.perf_counter()
+    if mode == "legacy":
+        count = len(legacy_chunks(root))
+    else:
+        count = sum(1 for _ in streaming_chunks(root))
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:<10} {elapsed:6.2f} s  chunks {count:>7}  peak RSS {peak_mb:7.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=50000)
+    parser.add_argument("--file-kb", type=int, default=4)
+    parser.add_argument("--mode", choices=("legacy", "streaming"), help=argparse.SUPPRESS)
+    parser.add_argument("--root", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.root)
+        return
+
+    root = tempfile.mkdtemp(prefix="doc_tree_")
+    try:
+        start = time.perf_counter()
+        make_tree(root, args.files, args.file_kb)
+        print(f"built {args.files} source files (+{args.files} in node_modules) "
+              f"in {time.perf_counter() - start:.1f} s")
+        for mode in ("legacy", "streaming"):
+            subprocess.run([sys.executable, __file__, "--mode", mode, "--root", root], check=True,
+                           env={**os.environ, "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "unused")})
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
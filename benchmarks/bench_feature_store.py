@@ -0,0 +1,178 @@
+"""
+Feature engineering in model_step1 at --assignments rows (default 1M): the old
+full-table read_sql + apply(axis=1), the GROUP BY rebuild, and a --since update
+after a batch of new assignments, new feedback and status changes.
+
+Runs against a generated SQLite database. Each phase runs in its own process
+and reports wall time and peak RSS; the incremental features are checked
+against a full rebuild.
+
+    python benchmarks/bench_feature_store.py --assignments 1000000 --employees 5000
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+START = np.datetime64("2025-01-01T00:00:00")
+
+
+def create_database(path, employees, assignments, feedback, seed=0):
+    rng = np.random.default_rng(seed)
+    db = sqlite3.connect(path)
+    db.executescript("""
+        CREATE TABLE employee_details (employee_id INTEGER PRIMARY KEY, email TEXT, skills TEXT, domains TEXT);
+        CREATE TABLE assignments (id INTEGER PRIMARY KEY, subtask_id INTEGER, employee_id INTEGER,
+                                  status INTEGER, createdAt TEXT, updatedAt TEXT);
+        CREATE TABLE feedback (id INTEGER PRIMARY KEY, employee_id INTEGER, project_id TEXT,
+                               feedback_message TEXT, score INTEGER, createdAt TEXT);
+        CREATE INDEX ix_assignments_employee_id ON assignments (employee_id);
+        CREATE INDEX ix_assignments_updatedAt ON assignments (updatedAt);
+    """)
+    db.executemany("INSERT INTO employee_details VALUES (?, ?, '', '')",
+                   ((i, f"e{i}@example.com") for i in range(1, employees + 1)))
+    insert_assignments(db, rng, employees, assignments, START)
+    insert_feedback(db, rng, employees, feedback)
+    db.commit()
+    db.close()
+
+
+def timestamps(start, offset, n):
+    """One row per second from start + offset seconds, as 'YYYY-MM-DDTHH:MM:SS' strings."""
+    return (start + np.arange(offset, offset + n).astype("timedelta64[s]")).astype(str).tolist()
+
+
+def insert_assignments(db, rng, employees, count, start):
+    for first in range(0, count, 100_000):
+        n = min(100_000, count - first)
+        owners = rng.integers(1, employees + 1, n).tolist()
+        status = (rng.random(n) < 0.6).astype(int).tolist()
+        stamps = timestamps(start, first, n)
+        db.executemany("INSERT INTO assignments (subtask_id, employee_id, status, createdAt, updatedAt) "
+                       "VALUES (1, ?, ?, ?, ?)", zip(owners, status, stamps, stamps))
+
+
+def insert_feedback(db, rng, employees, count):
+    owners = rng.integers(1, employees + 1, count).tolist()
+    db.executemany("INSERT INTO feedback (employee_id, project_id, feedback_message, score, createdAt) "
+                   "VALUES (?, 'p', 'ok', 5, ?)", zip(owners, timestamps(START, 0, count)))
+
+
+def apply_changes(path, employees, assignments, feedback, updates, deletes=0, seed=1):
+    """New assignments and feedback, status flips on existing assignments and optional deletes."""
+    rng = np.random.default_rng(seed)
+    db = sqlite3.connect(path)
+    later = START + np.timedelta64(365, "D")
+    insert_assignments(db, rng, employees, assignments, later)
+    insert_feedback(db, rng, employees, feedback)
+    max_id = db.execute("SELECT MAX(id) FROM assignments").fetchone()[0]
+    ids = rng.integers(1, max_id - assignments, updates).tolist()
+    db.executemany("UPDATE assignments SET status = 1 - status, updatedAt = ? WHERE id = ?",
+                   ((str(later), i) for i in ids))
+    if deletes:
+        db.executemany("DELETE FROM feedback WHERE id = ?", ((i,) for i in range(1, deletes + 1)))
+    db.commit()
+    db.close()
+
+
+def legacy_features(engine):
+    """model_step1's feature code before the feature store, trimmed to the features."""
+    import pandas as pd
+
+    employees_df = pd.read_sql("SELECT employee_id, email, skills, domains FROM employee_details", engine)
+    assignments_df = pd.read_sql("SELECT * FROM assignments", engine)
+    feedback_df = pd.read_sql("SELECT * FROM feedback", engine)
+    assignment_counts = assignments_df.groupby("employee_id")["status"].agg(
+        total_assignments="count",
+        completed_assignments=lambda s: (s == 1).sum()
+    ).reset_index()
+    assignment_counts["completion_ratio"] = assignment_counts.apply(
+        lambda row: (row["completed_assignments"] / row["total_assignments"] * 100)
+        if row["total_assignments"] > 0 else 0,
+        axis=1
+    )
+    feedback_counts = feedback_df.groupby("employee_id")["id"].count().reset_index().rename(
+        columns={"id": "feedback_count"})
+    features_df = employees_df.merge(assignment_counts, on="employee_id", how="left") \
+                              .merge(feedback_counts, on="employee_id", how="left")
+    return features_df.fillna(0)
+
+
+def run_phase(phase, db_path, store_path, out_path):
+    sys.path.insert(0, ROOT)
+    os.environ["FEATURE_STORE_PATH"] = store_path
+    from sqlalchemy import create_engine
+    import model_step1
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    start = time.perf_counter()
+    if phase == "legacy":
+        features = legacy_features(engine)
+    else:
+        store = model_step1.FeatureStore(store_path)
+        features = model_step1.build_features(engine, store, since=(phase == "since"))
+        store.close()
+    elapsed = time.perf_counter() - start
+    if out_path:
+        features.set_index("employee_id")[model_step1.FEATURES].sort_index().to_csv(out_path)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"seconds": elapsed, "rss_mb": rss}))
+
+
+def phase(name, db_path, store_path, out_path=""):
+    result = subprocess.run([sys.executable, __file__, "--phase", name, db_path, store_path, out_path],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--assignments", type=int, default=1_000_000)
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--feedback", type=int, default=200_000)
+    parser.add_argument("--new", type=int, default=10_000, help="assignments added before the --since run")
+    parser.add_argument("--updates", type=int, default=1_000, help="status changes before the --since run")
+    parser.add_argument("--deletes", type=int, default=0,
+                        help="feedback rows deleted before the --since run (forces a full rebuild)")
+    parser.add_argument("--phase", nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.phase:
+        run_phase(*args.phase)
+        return
+
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, "bench.sqlite")
+    store_path = os.path.join(workdir, "features.sqlite")
+    start = time.perf_counter()
+    create_database(db_path, args.employees, args.assignments, args.feedback)
+    print(f"generated {args.assignments} assignments, {args.feedback} feedback rows, "
+          f"{args.employees} employees in {time.perf_counter() - start:.1f}s")
+
+    def report(label, stats):
+        print(f"{label:<34} {stats['seconds']:7.2f}s  peak RSS {stats['rss_mb']:7.1f} MB")
+
+    report("legacy read_sql + apply", phase("legacy", db_path, store_path))
+    report("GROUP BY rebuild", phase("full", db_path, store_path))
+
+    apply_changes(db_path, args.employees, args.new, args.new // 10, args.updates, args.deletes)
+    incremental_csv = os.path.join(workdir, "since.csv")
+    report(f"--since (+{args.new} rows, {args.updates} updates)",
+           phase("since", db_path, store_path, incremental_csv))
+    rebuilt_csv = os.path.join(workdir, "full.csv")
+    phase("full", db_path, os.path.join(workdir, "fresh.sqlite"), rebuilt_csv)
+    with open(incremental_csv) as a, open(rebuilt_csv) as b:
+        print(f"--since features match a full rebuild: {a.read() == b.read()}")
+    shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
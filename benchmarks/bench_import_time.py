@@ -0,0 +1,105 @@
+"""
+Import-time regression check for the Python entry points (python -X importtime).
+
+For each entry module it reports the median cumulative import time over --runs
+fresh interpreters and fails (exit code 1) if a module that its CLI path must
+not load at import time shows up, e.g. openai or flask for task_assigner.
+
+With --against REV the same modules are also timed with REV's versions of the
+files in LAZY_FILES (the rest of the tree is the working copy) and the run
+fails unless task_assigner imports in at most --max-ratio of REV's time.
+
+    python benchmarks/bench_import_time.py --runs 7
+    python benchmarks/bench_import_time.py --against HEAD~1 --max-ratio 0.5
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# Entry module -> modules its import must not pull in.
+ENTRY_POINTS = {
+    "task_assigner": ["openai", "flask", "pandas", "scipy.sparse", "scipy.optimize"],
+    "task_generator": ["flask", "pandas", "scipy"],
+    "model_tasks": ["pandas", "sklearn", "model_registry"],
+}
+# Files whose REV version replaces the working copy for --against.
+LAZY_FILES = ["task_assigner.py", "skill_matching.py", "model_tasks.py", "task_generator.py"]
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile(module, path_prefix=None):
+    """(cumulative µs for module, set of every module imported) from one fresh interpreter."""
+    # -c puts the working directory first on sys.path, so the prefix goes in explicitly.
+    code = f"import sys; sys.path.insert(0, {path_prefix!r}); import {module}" if path_prefix else f"import {module}"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    total, loaded = None, set()
+    for match in LINE.finditer(result.stderr):
+        name = match.group(4)
+        loaded.add(name)
+        if name == module and not match.group(3).strip(" ") and len(match.group(3)) == 1:
+            total = int(match.group(2))
+    return total, loaded
+
+
+def median_import(module, runs, path_prefix=None):
+    times, loaded = [], set()
+    for _ in range(runs):
+        total, loaded = import_profile(module, path_prefix)
+        times.append(total)
+    return statistics.median(times), loaded
+
+
+def checkout_files(rev, directory):
+    for name in LAZY_FILES:
+        content = subprocess.run(["git", "show", f"{rev}:{name}"], cwd=ROOT, capture_output=True)
+        if content.returncode == 0:
+            with open(os.path.join(directory, name), "wb") as f:
+                f.write(content.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--against", help="git revision to compare with")
+    parser.add_argument("--max-ratio", type=float, default=0.5,
+                        help="with --against: task_assigner import time must be at most this fraction of REV's")
+    args = parser.parse_args()
+
+    failures = []
+    baseline = {}
+    if args.against:
+        with tempfile.TemporaryDirectory() as old_tree:
+            checkout_files(args.against, old_tree)
+            for module in ENTRY_POINTS:
+                baseline[module], _ = median_import(module, args.runs, old_tree)
+
+    for module, forbidden in ENTRY_POINTS.items():
+        median, loaded = median_import(module, args.runs)
+        line = f"{module:<16} {median / 1000:8.1f} ms"
+        if module in baseline:
+            ratio = median / baseline[module]
+            line += f"   {args.against}: {baseline[module] / 1000:8.1f} ms  ({ratio:.2f}x)"
+            if module == "task_assigner" and ratio > args.max_ratio:
+                failures.append(f"task_assigner imports in {ratio:.2f}x of {args.against}'s time "
+                                f"(limit {args.max_ratio}x)")
+        print(line)
+        eager = sorted(name for name in forbidden if name in loaded)
+        if eager:
+            failures.append(f"{module} imports {', '.join(eager)} at import time")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Mermaid rendering for build_docx: the old one-diagram-at-a-time loop against the
+parallel renderer, cold and with a warm PNG cache, using the stub mmdc.
+
+    python benchmarks/bench_mermaid.py --diagrams 24 --delay 0.5 --workers 8
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+
+from docx import Document
+
+import documentation_agent
+
+STUB = (sys.executable, os.path.join(HERE, "stub_mmdc.py"))
+
+
+def sample_markdown(n):
+    parts = ["# Project Overview\n\nSome text."]
+    for i in range(n):
+        parts.append(f"## Flow {i}\n\n```mermaid\ngraph TD\n  A{i}-->B{i}\n```")
+    parts.append("```mermaid\ninvalid diagram\n```")
+    return "\n\n".join(parts)
+
+
+def legacy_render(md_text, tmp):
+    """The old loop: write .mmd, run mmdc, embed, delete; one diagram at a time."""
+    for idx, chunk in enumerate(documentation_agent.MERMAID_RE.split(md_text)):
+        if idx % 2:
+            mmd, png = os.path.join(tmp, f"__tmp_{idx}.mmd"), os.path.join(tmp, f"__diag_{idx}.png")
+            with open(mmd, "w", encoding="utf-8") as f:
+                f.write(chunk.strip())
+            subprocess.run([*STUB, "-i", mmd, "-o", png, "-b", "transparent"],
+                           stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            for path in (mmd, png):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--diagrams", type=int, default=24)
+    parser.add_argument("--delay", type=float, default=0.5, help="seconds per stub render")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    os.environ["MMDC_DELAY"] = str(args.delay)
+    md = sample_markdown(args.diagrams)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        legacy_render(md, tmp)
+        print(f"sequential (old loop)  {time.perf_counter() - start:6.2f} s")
+
+        cache_dir = os.path.join(tmp, "cache")
+        for label in (f"{args.workers} workers, cold cache", f"{args.workers} workers, warm cache"):
+            doc = Document()
+            start = time.perf_counter()
+            documentation_agent.render_and_embed_mermaid(md, doc, renderer=STUB, cache_dir=cache_dir,
+                                                         workers=args.workers)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<22} {elapsed:6.2f} s  pictures embedded {len(doc.inline_shapes)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Completing N milestones for one employee against the stub milestone app:
+the old one-browser-per-milestone loop, the session pool, and the batch API.
+
+Browser modes need Chrome and a matching driver; without them they are reported
+as skipped and only the API mode runs.
+
+    python benchmarks/bench_milestone_agent.py --milestones 20
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from selenium.common.exceptions import WebDriverException
+
+import ai_agent
+from stub_milestone_app import start_stub_app
+
+EMAIL = "dev@example.com"
+
+
+def legacy(names, app_url):
+    """The old flow: new Chrome, log in, sleep 2 s and click, once per milestone."""
+    for name in names:
+        driver = ai_agent.new_chrome(headless=True)
+        try:
+            session = ai_agent.MilestoneSession(driver, EMAIL, app_url)
+            time.sleep(2)
+            session.complete(name)
+        finally:
+            driver.quit()
+
+
+def pooled(names, app_url):
+    with ai_agent.BrowserSessionPool(headless=True, app_url=app_url) as pool:
+        pool.complete_milestones(EMAIL, names)
+
+
+def api(names, app_url):
+    ai_agent.complete_milestones_via_api(names, EMAIL, api_url=app_url)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--milestones", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per stub API call")
+    args = parser.parse_args()
+    names = [f"Milestone {i + 1}" for i in range(args.milestones)]
+    try:
+        ai_agent.new_chrome(headless=True).quit()
+        have_chrome = True
+    except WebDriverException as e:
+        have_chrome = False
+        print(f"Chrome unavailable, browser modes skipped: {e.msg or e}".splitlines()[0])
+
+    modes = [("browser per milestone", legacy), ("browser session pool", pooled)] if have_chrome else []
+    for label, run in modes + [("batch API", api)]:
+        app = start_stub_app(names, latency=args.latency)
+        start = time.perf_counter()
+        try:
+            run(names, app.url)
+            elapsed = time.perf_counter() - start
+        finally:
+            app.shutdown()
+        print(f"{label:<22} {elapsed:7.2f} s  completed {len(app.completed)}/{len(names)}")
+
+
+if __name__ == "__main__":
+    main()
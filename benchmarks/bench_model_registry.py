@@ -0,0 +1,122 @@
+"""
+Cost of loading the performance model per request (the old /api/test-prediction)
+against model_registry, and a hot-reload check under concurrent predictions.
+
+The reload phase keeps --threads threads predicting through registry.get() while
+the model file is swapped between two versions; it reports the slowest predict
+call seen during swaps and any failed predictions (there should be none).
+
+    python benchmarks/bench_model_registry.py --requests 50 --threads 8 --swaps 5
+"""
+import argparse
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import warnings
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from model_registry import ModelRegistry  # noqa: E402
+
+MODEL_PATH = os.path.join(ROOT, "employee_performance_model.pkl")
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+ROW = np.array([[20, 15, 75.0, 3]], dtype=np.float64)
+
+
+def per_request(requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        with open(MODEL_PATH, "rb") as f:
+            pickle.load(f).predict(ROW)
+    return time.perf_counter() - start
+
+
+def with_registry(requests):
+    registry = ModelRegistry()
+    registry.register("default", MODEL_PATH)
+    start = time.perf_counter()
+    for _ in range(requests):
+        registry.get().model.predict(ROW)
+    return time.perf_counter() - start
+
+
+def hot_reload(threads, swaps):
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "model.pkl")
+    with open(MODEL_PATH, "rb") as f:
+        model = pickle.load(f)
+    variant = pickle.loads(pickle.dumps(model))
+    variant.estimators_ = variant.estimators_[: len(variant.estimators_) // 2]  # different bytes
+    versions = [pickle.dumps(model), pickle.dumps(variant)]
+    with open(path, "wb") as f:
+        f.write(versions[0])
+
+    registry = ModelRegistry(check_interval=0)
+    registry.register("default", path)
+    registry.get()
+    stop = threading.Event()
+    stats = {"calls": 0, "errors": 0, "slowest": 0.0, "hashes": set()}
+    lock = threading.Lock()
+
+    def predictor():
+        while not stop.is_set():
+            begin = time.perf_counter()
+            try:
+                entry = registry.get()
+                entry.model.predict(ROW)
+                ok = True
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - begin
+            with lock:
+                stats["calls"] += 1
+                stats["errors"] += not ok
+                stats["slowest"] = max(stats["slowest"], elapsed)
+                if ok:
+                    stats["hashes"].add(entry.sha256)
+
+    workers = [threading.Thread(target=predictor) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for i in range(swaps):
+        time.sleep(0.2)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(versions[(i + 1) % 2])
+        os.replace(tmp, path)  # atomic on the filesystem as well
+    time.sleep(0.2)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    shutil.rmtree(workdir)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--swaps", type=int, default=5)
+    args = parser.parse_args()
+
+    before = per_request(args.requests)
+    after = with_registry(args.requests)
+    print(f"per-request pickle.load: {before / args.requests * 1000:8.2f} ms/request")
+    print(f"model_registry:          {after / args.requests * 1000:8.2f} ms/request "
+          f"(first call includes the load)  {before / after:.1f}x")
+
+    stats = hot_reload(args.threads, args.swaps)
+    print(f"hot reload: {args.swaps} swaps under {args.threads} threads, {stats['calls']} predictions, "
+          f"{stats['errors']} errors, {len(stats['hashes'])} model versions served, "
+          f"slowest call {stats['slowest'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
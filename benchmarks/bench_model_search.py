@@ -0,0 +1,64 @@
+"""
+model_step1's hyperparameter search on synthetic employee features: wall time
+with one worker against --jobs workers, the candidates it measured, and which
+forest model_registry.choose_artifact would serve for a few latency budgets.
+
+    python benchmarks/bench_model_search.py --rows 4000 --jobs 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import model_step1  # noqa: E402
+from bench_compiled_forest import synthetic_features  # noqa: E402
+from model_registry import choose_artifact  # noqa: E402
+
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+
+def run(jobs, data, workdir):
+    start = time.perf_counter()
+    chosen, front, results = model_step1.search_models(*data, workdir, jobs=jobs)
+    return time.perf_counter() - start, chosen, front, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=4000)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    X, y = synthetic_features(args.rows)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    data = (X_train, y_train, X_test, y_test)
+    print(f"{len(model_step1.SEARCH_GRID)} candidates x {model_step1.CV_FOLDS} folds on {len(X_train)} rows, "
+          f"{os.cpu_count()} CPU(s)")
+
+    with tempfile.TemporaryDirectory() as serial_dir, tempfile.TemporaryDirectory() as parallel_dir:
+        serial, *_ = run(1, data, serial_dir)
+        parallel, chosen, front, results = run(args.jobs, data, parallel_dir)
+        print(f"search wall time: 1 worker {serial:.1f}s, {args.jobs} workers {parallel:.1f}s "
+              f"({serial / parallel:.1f}x)")
+
+        print(f"{'candidate':<14} {'CV R²':>8} {'test R²':>8} {'ms/1 row':>9} {'µs/row':>8} {'size KB':>9}")
+        for r in sorted(results, key=lambda r: -r["cv_r2"]):
+            mark = " <- chosen" if r is chosen else " (pareto)" if r in front else ""
+            print(f"{r['name']:<14} {r['cv_r2']:8.4f} {r['test_r2']:8.4f} {r['latency_ms_per_row']:9.3f} "
+                  f"{r['batch_latency_us_per_row']:8.2f} {r['size_bytes'] / 1024:9.1f}{mark}")
+
+        paths = [r["forest_path"] for r in front]
+        for budget in (0.1, 0.2, 0.5, 5.0):
+            picked = choose_artifact(paths, budget)
+            print(f"latency budget {budget:4.1f} ms -> {os.path.basename(picked)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Throughput of model_service: the old per-request DataFrame endpoint against the
+micro-batched /api/predict and the vectorized /api/predict/batch.
+
+Each server runs in its own process; --clients threads send requests over
+keep-alive connections for --seconds each and report req/s and p50/p99 latency.
+
+    python benchmarks/bench_model_service.py --clients 16 --seconds 5
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def serve(kind, port):
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    if kind == "legacy":
+        os.environ["MICRO_BATCH_WAIT_MS"] = "0"
+    import model_service
+    from werkzeug.serving import make_server
+
+    app = model_service.app
+    if kind == "legacy":
+        import pandas as pd
+        from flask import Flask, jsonify, request
+
+        app = Flask("legacy")
+
+        @app.route("/api/predict", methods=["POST"])
+        def predict():
+            df = pd.DataFrame([request.get_json()])
+            return jsonify({"prediction": float(model_service.registry.get().model.predict(df)[0])})
+
+    make_server("127.0.0.1", port, app, threaded=True).serve_forever()
+
+
+def random_row(rng):
+    total = rng.randint(0, 40)
+    done = rng.randint(0, total)
+    return {"total_assignments": total, "completed_assignments": done,
+            "completion_ratio": done / total * 100 if total else 0, "feedback_count": rng.randint(0, 10)}
+
+
+def load(port, path, make_body, clients, seconds):
+    latencies, lock = [], threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def client(seed):
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        mine = []
+        while time.perf_counter() < stop:
+            body = json.dumps(make_body(rng))
+            start = time.perf_counter()
+            conn.request("POST", path, body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            assert response.status == 200, response.status
+            mine.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies.sort()
+    return len(latencies) / seconds, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+
+
+def wait_for(port):
+    for _ in range(200):
+        try:
+            http.client.HTTPConnection("127.0.0.1", port, timeout=1).connect()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"server on {port} did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--batch-rows", type=int, default=100)
+    parser.add_argument("--serve", choices=("legacy", "current"), help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=5101, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    cases = [
+        ("legacy", "/api/predict", random_row, 1, "old endpoint (DataFrame per request)"),
+        ("current", "/api/predict", random_row, 1, "micro-batched /api/predict"),
+        ("current", "/api/predict/batch",
+         lambda rng: {"rows": [random_row(rng) for _ in range(args.batch_rows)]}, args.batch_rows,
+         f"/api/predict/batch x{args.batch_rows}"),
+    ]
+    for i, (kind, path, make_body, rows, label) in enumerate(cases):
+        port = args.port + i
+        server = subprocess.Popen([sys.executable, __file__, "--serve", kind, "--port", str(port)],
+                                  stderr=subprocess.DEVNULL)
+        try:
+            wait_for(port)
+            load(port, path, make_body, 2, 0.5)  # warm up
+            rps, p50, p99 = load(port, path, make_body, args.clients, args.seconds)
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"{label:<38} {rps:8.0f} req/s  {rps * rows:9.0f} rows/s  "
+              f"p50 {p50 * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Time-to-first-item of the streaming task preview vs the blocking one.
+
+Runs generate_tasks_preview and generate_tasks_preview_stream against the local
+mock OpenAI server (see mock_openai_server.py) and a SQLite project row.
+
+    python benchmarks/bench_preview_stream.py --latency 0.5 --token-delay 0.004
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ["DATABASE_URL"] = "sqlite://"  # db.py shares one in-memory connection
+
+import openai
+
+import llm_cache
+import model_tasks
+from mock_openai_server import start_mock_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--token-delay", type=float, default=0.004)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    server = start_mock_server(latency=args.latency, token_delay=args.token_delay)
+    openai.api_base = server.base_url
+    openai.api_key = "mock"
+    llm_cache._default_cache = llm_cache.LLMCache(path=None)  # every run must reach the "LLM"
+
+    model_tasks.Base.metadata.create_all(model_tasks.engine)
+    model_tasks.session.add(model_tasks.Project(project_id=1, project_name="Bench",
+                                                project_description="A web shop."))
+    model_tasks.session.commit()
+
+    for i in range(args.repeat):
+        start = time.perf_counter()
+        preview = model_tasks.generate_tasks_preview(1, f"blocking run {i}")
+        total = time.perf_counter() - start
+        assert "tasks" in preview, preview
+        print(f"blocking   first item {total:6.2f} s  complete {total:6.2f} s")
+
+        start = time.perf_counter()
+        first_task = first_subtask = None
+        counts = {}
+        for event, _ in model_tasks.generate_tasks_preview_stream(1, f"streaming run {i}"):
+            counts[event] = counts.get(event, 0) + 1
+            now = time.perf_counter() - start
+            if event == "task" and first_task is None:
+                first_task = now
+            if event == "subtask" and first_subtask is None:
+                first_subtask = now
+        total = time.perf_counter() - start
+        assert counts.get("done") == 1, counts
+        print(f"streaming  first task {first_task:6.2f} s  first subtask {first_subtask:6.2f} s  "
+              f"complete {total:6.2f} s  events {counts}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Greedy subtask assignment: the original per-pair loop vs skill_matching.SkillMatcher.
+
+Both run on the same synthetic employees/subtasks and must produce identical
+assignments. --matcher-only skips the quadratic legacy loop so the matcher can
+be timed at tens of thousands of employees and subtasks.
+
+    python benchmarks/bench_skill_matching.py --employees 2000 --subtasks 2000
+    python benchmarks/bench_skill_matching.py --employees 50000 --subtasks 50000 --matcher-only
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from skill_matching import SkillMatcher
+from task_assigner import match_employee_to_subtask
+
+WORDS = [
+    "api", "auth", "backend", "frontend", "database", "schema", "react", "python", "design",
+    "testing", "deploy", "docker", "css", "ui", "ux", "security", "cache", "search", "ml",
+    "data", "pipeline", "report", "mobile", "payments", "email", "logging", "metrics", "sql",
+    "graphql", "websocket", "oauth", "session", "migration", "index", "queue", "worker",
+]
+
+
+def make_data(n_employees, n_subtasks, seed):
+    rng = random.Random(seed)
+    employees = [
+        SimpleNamespace(
+            employee_id=i,
+            skills=",".join(rng.sample(WORDS, rng.randint(1, 5))),
+            domains=",".join(rng.sample(WORDS, rng.randint(0, 3))),
+        )
+        for i in range(n_employees)
+    ]
+    subtasks = [
+        SimpleNamespace(id=i, name=" ".join(w.capitalize() for w in rng.sample(WORDS, rng.randint(2, 6))))
+        for i in range(n_subtasks)
+    ]
+    return employees, subtasks
+
+
+def legacy_assign(employees, subtasks):
+    """The loop assign_employees_to_subtasks ran before SkillMatcher."""
+    available_employees = list(employees)
+    pairs = []
+    for subtask in subtasks:
+        employee_matches = [(e, match_employee_to_subtask(e, subtask)) for e in available_employees]
+        employee_matches = sorted(employee_matches, key=lambda x: x[1], reverse=True)
+        if not employee_matches or employee_matches[0][1] == 0:
+            continue
+        best_employee = employee_matches[0][0]
+        available_employees.remove(best_employee)
+        pairs.append((subtask.id, best_employee.employee_id))
+        if not available_employees:
+            break
+    return pairs
+
+
+def matcher_assign(employees, subtasks):
+    return [(s.id, e.employee_id) for s, e in SkillMatcher(employees).assign_greedy(subtasks)]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--subtasks", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--matcher-only", action="store_true")
+    args = parser.parse_args()
+
+    employees, subtasks = make_data(args.employees, args.subtasks, args.seed)
+    fast, fast_time = timed(matcher_assign, employees, subtasks)
+    print(f"matcher {args.subtasks}x{args.employees}: {fast_time * 1000:9.1f} ms, {len(fast)} assignments")
+    if args.matcher_only:
+        return
+
+    slow, slow_time = timed(legacy_assign, employees, subtasks)
+    print(f"legacy  {args.subtasks}x{args.employees}: {slow_time * 1000:9.1f} ms, {len(slow)} assignments")
+    if slow != fast:
+        sys.exit("MISMATCH: matcher assignments differ from the legacy loop")
+    print(f"identical assignments, speedup {slow_time / fast_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
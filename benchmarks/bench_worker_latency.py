@@ -0,0 +1,86 @@
+"""
+Cold-spawn vs warm-worker latency for task_assigner.py / task_generator.py.
+
+"cold" starts a fresh interpreter per job, the way server.js used to spawn the
+scripts; "warm" sends the same jobs to one long-lived --worker process.
+Without --project-id the jobs are pings, which isolates interpreter start-up,
+imports and engine creation from the database work itself.
+
+    python benchmarks/bench_worker_latency.py --script task_assigner.py -n 20
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def job_line(job_id, project_id):
+    job = {"id": job_id, "project_id": project_id} if project_id else {"id": job_id, "op": "ping"}
+    return json.dumps(job) + "\n"
+
+
+def cold(script, project_id, n):
+    timings = []
+    for i in range(n):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, script, "--worker"],
+            input=job_line(i, project_id), capture_output=True, text=True, cwd=ROOT,
+        )
+        timings.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            sys.exit(f"cold run failed:\n{proc.stderr}")
+    return timings
+
+
+def warm(script, project_id, n):
+    proc = subprocess.Popen(
+        [sys.executable, script, "--worker"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, cwd=ROOT,
+    )
+    # One untimed job so the worker has finished importing before we measure.
+    proc.stdin.write(job_line(-1, None))
+    proc.stdin.flush()
+    proc.stdout.readline()
+
+    timings = []
+    for i in range(n):
+        start = time.perf_counter()
+        proc.stdin.write(job_line(i, project_id))
+        proc.stdin.flush()
+        reply = json.loads(proc.stdout.readline())
+        timings.append(time.perf_counter() - start)
+        assert reply["id"] == i, reply
+    proc.stdin.close()
+    proc.wait()
+    return timings
+
+
+def report(label, timings):
+    ordered = sorted(timings)
+    p50 = statistics.median(ordered) * 1000
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)] * 1000
+    print(f"{label:<5} n={len(ordered):<4} p50 {p50:9.2f} ms  p95 {p95:9.2f} ms")
+    return p50
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--script", default="task_assigner.py",
+                        choices=["task_assigner.py", "task_generator.py"])
+    parser.add_argument("--project-id", type=int, help="send real jobs for this project instead of pings")
+    parser.add_argument("-n", type=int, default=20)
+    args = parser.parse_args()
+
+    cold_p50 = report("cold", cold(args.script, args.project_id, args.n))
+    warm_p50 = report("warm", warm(args.script, args.project_id, args.n))
+    print(f"warm worker is {cold_p50 / warm_p50:.0f}x faster at p50")
+
+
+if __name__ == "__main__":
+    main()
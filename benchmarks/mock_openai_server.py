@@ -0,0 +1,178 @@
+"""
+A local stand-in for the OpenAI chat completions API, for benchmarks and manual testing.
+
+Serves POST /v1/chat/completions in both blocking and stream=True (Server-Sent
+Events) mode with configurable latency, so scripts can be pointed at it with
+OPENAI_API_BASE=http://127.0.0.1:<port>/v1 (or openai.api_base).
+
+    python benchmarks/mock_openai_server.py --port 8765 --latency 0.5 --token-delay 0.01
+
+From Python, start_mock_server() runs it on a background thread and returns the
+server, whose .base_url and .stats can be inspected.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHARS_PER_TOKEN = 4
+
+
+def sample_plan(categories=3, tasks_per_category=3, subtasks_per_task=3):
+    """A task preview shaped like the one model_tasks asks gpt-3.5-turbo for."""
+    return json.dumps({
+        "tasks": [
+            {
+                "category": f"Category {c + 1}",
+                "tasks": [
+                    {
+                        "task": f"Task {c + 1}.{t + 1}",
+                        "subtasks": [
+                            {
+                                "name": f"Subtask {c + 1}.{t + 1}.{s + 1}",
+                                "milestones": [{"name": f"Milestone {m + 1}"} for m in range(5)],
+                            }
+                            for s in range(subtasks_per_task)
+                        ],
+                    }
+                    for t in range(tasks_per_category)
+                ],
+            }
+            for c in range(categories)
+        ]
+    }, indent=2)
+
+
+def plan_responder(request):
+    return sample_plan()
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # load tests open hundreds of connections at once
+
+    def __init__(self, address, responder=plan_responder, latency=0.0, token_delay=0.0, error_rate=0.0):
+        super().__init__(address, MockOpenAIHandler)
+        self.responder = responder
+        self.latency = latency
+        self.token_delay = token_delay
+        self.error_rate = error_rate
+        self.stats = {"requests": 0, "errors": 0, "in_flight": 0, "max_in_flight": 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def track(self, delta):
+        with self._stats_lock:
+            self.stats["in_flight"] += delta
+            if delta > 0:
+                self.stats["requests"] += 1
+                self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+        server.track(+1)
+        try:
+            time.sleep(server.latency)
+            if server.error_rate and random.random() < server.error_rate:
+                with server._stats_lock:
+                    server.stats["errors"] += 1
+                self._send_json(429, {"error": {"message": "Rate limit reached (mock)", "type": "rate_limit"}})
+                return
+            content = server.responder(request)
+            if request.get("stream"):
+                self._stream(request, content)
+            else:
+                time.sleep(server.token_delay * len(content) / CHARS_PER_TOKEN)
+                self._send_json(200, {
+                    "id": "chatcmpl-mock",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request.get("model", "mock"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": len(content) // CHARS_PER_TOKEN,
+                              "total_tokens": len(content) // CHARS_PER_TOKEN},
+                })
+        finally:
+            server.track(-1)
+
+    def _stream(self, request, content):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send(delta, finish_reason=None):
+            chunk = {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "mock"),
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        send({"role": "assistant"})
+        for i in range(0, len(content), CHARS_PER_TOKEN):
+            time.sleep(self.server.token_delay)
+            send({"content": content[i:i + CHARS_PER_TOKEN]})
+        send({}, finish_reason="stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def start_mock_server(responder=plan_responder, latency=0.0, token_delay=0.0, error_rate=0.0,
+                      host="127.0.0.1", port=0):
+    server = MockOpenAIServer((host, port), responder, latency, token_delay, error_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds per streamed token")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 429")
+    args = parser.parse_args()
+
+    server = MockOpenAIServer((args.host, args.port), plan_responder,
+                              args.latency, args.token_delay, args.error_rate)
+    print(f"Mock OpenAI API on {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
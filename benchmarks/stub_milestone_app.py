@@ -0,0 +1,157 @@
+"""
+A local stand-in for the employee UI and the milestone endpoints, for driving
+ai_agent.py without the React app, Express server or database.
+
+Serves a login form, a page with a "My Milestones" sidebar entry whose list is
+fetched from /api/employee-milestones, POST /api/log-milestone (what the Complete
+button calls) and POST /api/log-milestones/batch.
+
+    python benchmarks/stub_milestone_app.py --port 3100 --milestones 20
+    python ai_agent.py temp_aggregated.txt Backend dev@example.com   # with PROMANAGE_APP_URL/API_URL set
+
+start_stub_app() runs it on a background thread; .completed lists completions.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+LOGIN_PAGE = """<!doctype html><html><body>
+<form onsubmit="location.href='/dashboard?email='+encodeURIComponent(this.email.value); return false;">
+  <input name="email"><input name="password" type="password"><button type="submit">Login</button>
+</form></body></html>"""
+
+DASHBOARD_PAGE = """<!doctype html><html><body>
+<div class="sidebar"><div class="menu-item" id="nav"><span>My Milestones</span></div></div>
+<div class="content-container"></div>
+<script>
+const email = new URLSearchParams(location.search).get("email");
+document.getElementById("nav").onclick = async () => {
+  const box = document.querySelector(".content-container");
+  const data = await (await fetch("/api/employee-milestones?email=" + encodeURIComponent(email))).json();
+  box.innerHTML = "<h2>Your Milestones</h2><ul></ul>";
+  for (const m of data.milestones) {
+    const li = document.createElement("li");
+    li.textContent = m.milestone_name + " ";
+    const button = document.createElement("button");
+    button.className = "complete-btn";
+    button.textContent = "Complete";
+    button.onclick = async () => {
+      await fetch("/api/log-milestone", {method: "POST", headers: {"Content-Type": "application/json"},
+        body: JSON.stringify({employee_id: email, milestone_id: m.milestone_id, message: "Completed milestone"})});
+      li.remove();
+    };
+    li.appendChild(button);
+    box.querySelector("ul").appendChild(li);
+  }
+};
+</script></body></html>"""
+
+
+class StubMilestoneApp(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, milestone_names, latency=0.0):
+        super().__init__(address, StubMilestoneHandler)
+        self.latency = latency
+        self.milestones = [{"milestone_id": i + 1, "milestone_name": name, "status": 0}
+                           for i, name in enumerate(milestone_names)]
+        self.completed = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def complete(self, milestone_id):
+        with self.lock:
+            for m in self.milestones:
+                if m["milestone_id"] == milestone_id and m["status"] == 0:
+                    m["status"] = 1
+                    self.completed.append(m["milestone_name"])
+                    return True
+        return False
+
+
+class StubMilestoneHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json"):
+        data = body.encode("utf-8") if isinstance(body, str) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/":
+            self._send(200, LOGIN_PAGE, "text/html")
+        elif url.path == "/dashboard":
+            self._send(200, DASHBOARD_PAGE, "text/html")
+        elif url.path == "/api/employee-milestones":
+            time.sleep(self.server.latency)
+            with self.server.lock:
+                open_ = [m for m in self.server.milestones if m["status"] == 0]
+            self._send(200, {"milestones": open_})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        time.sleep(self.server.latency)
+        if self.path == "/api/log-milestone":
+            ok = self.server.complete(body.get("milestone_id"))
+            self._send(200 if ok else 404, {"success": ok})
+        elif self.path == "/api/log-milestones/batch":
+            completed, not_found = [], []
+            for milestone_id in body.get("milestone_ids", []):
+                with self.server.lock:
+                    match = next((m for m in self.server.milestones
+                                  if m["status"] == 0 and m["milestone_id"] == milestone_id), None)
+                if match and self.server.complete(milestone_id):
+                    completed.append({"name": match["milestone_name"], "milestone_id": milestone_id,
+                                      "status": 200, "result": {"success": True}})
+                else:
+                    not_found.append(milestone_id)
+            for name in body.get("milestone_names", []):
+                with self.server.lock:
+                    match = next((m for m in self.server.milestones
+                                  if m["status"] == 0 and name.lower() in m["milestone_name"].lower()), None)
+                if match and self.server.complete(match["milestone_id"]):
+                    completed.append({"name": name, "milestone_id": match["milestone_id"],
+                                      "status": 200, "result": {"success": True}})
+                else:
+                    not_found.append(name)
+            self._send(200, {"completed": completed, "not_found": not_found})
+        else:
+            self._send(404, {"error": "not found"})
+
+
+def start_stub_app(milestone_names, latency=0.0, host="127.0.0.1", port=0):
+    server = StubMilestoneApp((host, port), milestone_names, latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3100)
+    parser.add_argument("--milestones", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per API call")
+    args = parser.parse_args()
+
+    server = StubMilestoneApp((args.host, args.port),
+                              [f"Milestone {i + 1}" for i in range(args.milestones)], args.latency)
+    print(f"Stub milestone app on {server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
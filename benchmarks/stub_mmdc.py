@@ -0,0 +1,43 @@
+"""
+Stand-in for the Mermaid CLI (mmdc) that accepts the same -i/-o/-b flags,
+sleeps like a headless-browser render would, and writes a valid 1x1 PNG.
+
+    MMDC_DELAY=0.5 python benchmarks/stub_mmdc.py -i diagram.mmd -o diagram.png -b transparent
+
+A source containing the word "invalid" exits with status 1, like a syntax error.
+"""
+import argparse
+import os
+import struct
+import sys
+import time
+import zlib
+
+
+def png_bytes():
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 6, 0, 0, 0)
+    pixels = zlib.compress(b"\x00\x00\x00\x00\x00")
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", pixels) + chunk(b"IEND", b"")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-i", dest="input", required=True)
+    parser.add_argument("-o", dest="output", required=True)
+    parser.add_argument("-b", dest="background", default="white")
+    args = parser.parse_args()
+
+    time.sleep(float(os.getenv("MMDC_DELAY", "0.5")))
+    with open(args.input, encoding="utf-8") as f:
+        if "invalid" in f.read():
+            print("Parse error on line 1", file=sys.stderr)
+            sys.exit(1)
+    with open(args.output, "wb") as f:
+        f.write(png_bytes())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Flattened, pickle-free form of the RandomForestRegressor trained by model_step1.
+
+export_forest() concatenates every tree's nodes into four arrays and writes them
+as plain .npy files next to a small JSON manifest:
+
+    employee_performance_model.forest/
+        forest.json      format version, feature names, tree roots, depth, array hashes,
+                         and training metadata (metrics, latency, size) when known
+        feature.npy      int32, split feature per node (0 at leaves)
+        threshold.npy    float64, split threshold per node (+inf at leaves)
+        children.npy     int64 (n_nodes, 2), left/right child; leaves point at themselves
+        value.npy        float64, node prediction
+
+load_forest() checks the array hashes and memory-maps the arrays
+(allow_pickle=False, so loading runs no code), and CompiledForest.predict walks all trees for a whole batch at once, a
+few flat gathers per tree level instead of sklearn's per-call validation and
+joblib dispatch. Leaves loop back to themselves with an +inf threshold, so no
+masking is needed; finished (row, tree) pairs are dropped every PRUNE_EVERY
+levels. Inputs are rounded to float32 like sklearn does and tree outputs are
+summed in estimator order, so predictions match RandomForestRegressor.predict
+bit for bit.
+
+    python compiled_forest.py employee_performance_model.pkl   # export an existing model
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import pickle
+
+import numpy as np
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = "forest.json"
+ARRAYS = ("feature", "threshold", "children", "value")
+PRUNE_EVERY = 4
+# Rows per traversal pass; keeps the (trees x rows) index arrays cache-sized.
+CHUNK_ROWS = 1024
+
+
+def forest_path(model_path):
+    """employee_performance_model.pkl -> employee_performance_model.forest"""
+    return os.path.splitext(model_path)[0] + ".forest"
+
+
+def flatten_forest(model):
+    """A fitted single-output RandomForestRegressor as (arrays, roots, max_depth)."""
+    if getattr(model, "n_outputs_", 1) != 1 or not hasattr(model, "estimators_"):
+        raise ValueError("Only fitted single-output tree ensembles can be compiled.")
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        nodes = np.arange(tree.node_count)
+        leaf = tree.children_left < 0
+        features.append(np.where(leaf, 0, tree.feature))
+        thresholds.append(np.where(leaf, np.inf, tree.threshold))
+        lefts.append(np.where(leaf, nodes, tree.children_left) + offset)
+        rights.append(np.where(leaf, nodes, tree.children_right) + offset)
+        values.append(tree.value[:, 0, 0])
+        roots.append(offset)
+        offset += tree.node_count
+    arrays = {
+        "feature": np.concatenate(features).astype(np.int32),
+        "threshold": np.concatenate(thresholds).astype(np.float64),
+        # int64 so the gathers in CompiledForest never convert index arrays
+        "children": np.stack([np.concatenate(lefts), np.concatenate(rights)], axis=1).astype(np.int64),
+        "value": np.concatenate(values).astype(np.float64),
+    }
+    max_depth = max(estimator.tree_.max_depth for estimator in model.estimators_)
+    return arrays, roots, max_depth
+
+
+def export_forest(model, path, metadata=None):
+    """
+    Writes model to the directory at path. The arrays go first and the manifest
+    last, each via a temp file and os.replace, so a reader never sees a manifest
+    that points at half-written arrays.
+    """
+    arrays, roots, max_depth = flatten_forest(model)
+    os.makedirs(path, exist_ok=True)
+    hashes = {}
+    for name in ARRAYS:
+        target = os.path.join(path, f"{name}.npy")
+        with open(target + ".tmp", "wb") as f:
+            np.save(f, arrays[name], allow_pickle=False)
+        os.replace(target + ".tmp", target)
+        with open(target, "rb") as f:
+            hashes[name] = hashlib.sha256(f.read()).hexdigest()
+    names = getattr(model, "feature_names_in_", None)
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "n_features": int(model.n_features_in_),
+        "feature_names": [str(name) for name in names] if names is not None else None,
+        "roots": roots,
+        "max_depth": int(max_depth),
+        "node_count": int(arrays["value"].shape[0]),
+        "sha256": hashes,
+        "metadata": metadata or {},
+    }
+    write_manifest(path, manifest)
+    return path
+
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST_NAME)) as f:
+        return json.load(f)
+
+
+def write_manifest(path, manifest):
+    target = os.path.join(path, MANIFEST_NAME)
+    with open(target + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(target + ".tmp", target)
+
+
+def update_metadata(path, **metadata):
+    """Merges metadata into an exported forest's manifest (e.g. measured after export)."""
+    manifest = read_manifest(path)
+    manifest.setdefault("metadata", {}).update(metadata)
+    write_manifest(path, manifest)
+
+
+def forest_size(path):
+    """Bytes on disk of an exported forest."""
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+class CompiledForest:
+    def __init__(self, feature, threshold, children, value, roots, max_depth, feature_names=None,
+                 metadata=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children.reshape(-1)  # left of node i at 2*i, right at 2*i + 1
+        self.value = value
+        self.roots = np.asarray(roots, dtype=np.int64)
+        self.max_depth = max_depth
+        self.metadata = metadata or {}
+        self.n_features_in_ = None
+        if feature_names is not None:
+            self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+            self.n_features_in_ = len(feature_names)
+
+    def _matrix(self, X):
+        columns = getattr(X, "columns", None)
+        if columns is not None and hasattr(self, "feature_names_in_"):
+            X = X[list(self.feature_names_in_)]  # DataFrames may list features in any order
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if self.n_features_in_ is not None and X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has {X.shape[1]} features, the model expects {self.n_features_in_}.")
+        # Thresholds are float64 but sklearn compares against float32 inputs.
+        return np.ascontiguousarray(X, dtype=np.float64)
+
+    def _leaves(self, X):
+        """Leaf index per (tree, row) of a float64 matrix, flattened tree-major."""
+        n_rows, n_features = X.shape
+        flat = X.reshape(-1)
+        nodes = np.repeat(self.roots, n_rows)
+        row_offsets = np.tile(np.arange(n_rows) * n_features, len(self.roots))
+        leaves, live = nodes, np.arange(nodes.size)
+        for level in range(1, self.max_depth + 1):
+            went_right = flat.take(row_offsets + self.feature.take(nodes)) > self.threshold.take(nodes)
+            nodes = self.children.take(2 * nodes + went_right)
+            if level % PRUNE_EVERY == 0 and level < self.max_depth:
+                active = self.threshold.take(nodes) != np.inf
+                if not active.all():
+                    leaves[live] = nodes
+                    live, nodes, row_offsets = live[active], nodes[active], row_offsets[active]
+        leaves[live] = nodes
+        return leaves
+
+    def apply(self, X):
+        """Leaf index reached by each row in each tree, shape (n_trees, n_rows)."""
+        X = self._matrix(X)
+        return self._leaves(X).reshape(len(self.roots), X.shape[0])
+
+    def predict(self, X):
+        X = self._matrix(X)
+        totals = np.empty(X.shape[0])
+        for start in range(0, X.shape[0], CHUNK_ROWS):
+            chunk = X[start:start + CHUNK_ROWS]
+            # Reducing over the leading (tree) axis adds trees one after another,
+            # the same order RandomForestRegressor accumulates them in.
+            totals[start:start + len(chunk)] = (
+                self.value.take(self._leaves(chunk)).reshape(len(self.roots), len(chunk)).sum(axis=0)
+            )
+        return totals / len(self.roots)
+
+
+def load_forest(path, mmap=True, verify=True):
+    """
+    Loads a directory written by export_forest; mmap=False reads the arrays into
+    memory. With verify each array file must match the manifest's sha256, which
+    catches arrays from a newer export paired with the previous manifest while
+    an export is in progress (the manifest is written last).
+    """
+    manifest = read_manifest(path)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported compiled forest format {manifest.get('format_version')!r}.")
+    arrays = {}
+    for name in ARRAYS:
+        target = os.path.join(path, f"{name}.npy")
+        with open(target, "rb") as f:
+            if verify:
+                data = f.read()
+                if hashlib.sha256(data).hexdigest() != manifest["sha256"][name]:
+                    raise ValueError(f"{target} does not match the sha256 in its manifest.")
+            if not mmap:
+                arrays[name] = np.load(io.BytesIO(data) if verify else f, allow_pickle=False)
+                continue
+            arrays[name] = np.load(target, mmap_mode="r", allow_pickle=False)
+            if verify and os.fstat(f.fileno()).st_ino != os.stat(target).st_ino:
+                raise ValueError(f"{target} was replaced while it was being loaded.")
+    if arrays["value"].shape[0] != manifest["node_count"]:
+        raise ValueError(f"{path} arrays do not match its manifest.")
+    return CompiledForest(roots=manifest["roots"], max_depth=manifest["max_depth"],
+                          feature_names=manifest["feature_names"], metadata=manifest.get("metadata"),
+                          **arrays)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a pickled forest to the compiled format.")
+    parser.add_argument("model", help="pickled RandomForestRegressor, e.g. employee_performance_model.pkl")
+    parser.add_argument("--out", help="output directory (default: <model>.forest)")
+    args = parser.parse_args()
+
+    with open(args.model, "rb") as f:
+        model = pickle.load(f)
+    path = export_forest(model, args.out or forest_path(args.model))
+    print(f"Compiled forest written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Schema changes the Python services rely on that sequelize.sync() does not create
+on databases that already exist. Every migration is idempotent.
+
+    python db_migrations.py [database_url]     # default: DATABASE_URL, see db.py
+"""
+import sys
+
+from sqlalchemy import inspect, text
+
+import db
+
+# (table, index name, column). Names match SQLAlchemy's index=True naming, so the
+# models in task_assigner.py and these migrations agree.
+ASSIGNMENT_INDEXES = [
+    ("assignments", "ix_assignments_employee_id", "employee_id"),
+    ("assignments", "ix_assignments_subtask_id", "subtask_id"),
+]
+
+
+def add_assignment_indexes(engine):
+    """Index assignments(employee_id) and assignments(subtask_id) for the assigner's anti-joins."""
+    inspector = inspect(engine)
+    created = []
+    with engine.begin() as conn:
+        for table, name, column in ASSIGNMENT_INDEXES:
+            existing = {ix["name"] for ix in inspector.get_indexes(table)}
+            if name in existing:
+                continue
+            conn.execute(text(f"CREATE INDEX {name} ON {table} ({column})"))
+            created.append(name)
+    return created
+
+
+MIGRATIONS = [add_assignment_indexes]
+
+
+def main():
+    engine = db.create_engine(sys.argv[1]) if len(sys.argv) > 1 else db.engine
+    for migration in MIGRATIONS:
+        created = migration(engine)
+        print(f"{migration.__name__}: {', '.join(created) if created else 'already applied'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,192 @@
+import argparse
+import ast
+import asyncio
+import hashlib
+import codecs
+import json
 import os
+import random
 import re
 import subprocess
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 import openai
 from docx import Document
 from docx.shared import Inches
 
+import llm_cache
+from llm_cache import achat_completion_text
+
 # ——— CONFIG ———
 openai.api_key = os.getenv("OPENAI_API_KEY")
 PROJECT_ROOT = os.path.dirname(__file__)
 OUTPUT_MD   = os.path.join(PROJECT_ROOT, "DOCUMENTATION.md")
 OUTPUT_DOCX = os.path.join(PROJECT_ROOT, "DOCUMENTATION.docx")
+DOC_MODEL = "gpt-3.5-turbo"
+# Tokens per request (prompts + code + completion) the chunker fills up to.
+CONTEXT_TOKENS = int(os.getenv("DOC_CONTEXT_TOKENS", 8192))
+# Per-file content hashes and the Markdown generated for them, so reruns only
+# send changed files to the LLM.
+MANIFEST_PATH = os.path.join(PROJECT_ROOT, ".doc_manifest.json")
+MANIFEST_VERSION = 2
 
 # Path to mmdc executable from npm installation (Add .cmd extension for Windows)
-MMDC_PATH = "C:/Users/chand/AppData/Roaming/npm/mmdc.cmd"  # Full path with .cmd extension for Windows
+MMDC_PATH = os.getenv("MMDC_PATH", "C:/Users/chand/AppData/Roaming/npm/mmdc.cmd")  # Full path with .cmd extension for Windows
+# Rendered diagrams, keyed on a hash of their Mermaid source.
+MERMAID_CACHE_DIR = os.path.join(PROJECT_ROOT, ".mermaid_cache")
+MERMAID_WORKERS = int(os.getenv("MERMAID_WORKERS", os.cpu_count() or 4))
 
 # ——— 1) COLLECT & CHUNK ———
 SKIP_DIRS = {"node_modules", ".git", "__pycache__"}
 EXTS = (".py", ".js", ".jsx", ".ts", ".tsx", ".html", ".css")
 
-def collect_file_snippets(base_dir):
-    snippets = []
-    for root, dirs, files in os.walk(base_dir):
-        if any(sd in root for sd in SKIP_DIRS):
+READ_BLOCK = 64 * 1024
+# Bump when chunk boundaries change, so manifest sections are regenerated.
+CHUNKER_VERSION = 2
+PY_EXTS = (".py",)
+JS_EXTS = (".js", ".jsx", ".ts", ".tsx")
+
+def iter_source_files(base_dir):
+    """
+    Yields (relative path, absolute path) for every documented source file.
+    Skipped directories are pruned before they are entered, and each directory
+    is listed in name order so the output order is stable between runs.
+    """
+    pending = [base_dir]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            print(f"Error listing {current}: {e}")
             continue
-        for fn in files:
-            if fn.endswith(EXTS):
-                path = os.path.join(root, fn)
-                rel  = os.path.relpath(path, base_dir)
-                try:
-                    text = open(path, encoding="utf-8").read()
-                except Exception as e:
-                    print(f"Error reading {path}: {e}")
-                    continue
-                snippet = f"\n\n# File: {rel}\n```text\n{text}\n```"
-                snippets.append(snippet)
-    return snippets
-
-def split_long_snippet(snip, max_chars):
-    """Break a single snippet into multiple pieces of at most max_chars."""
-    parts = []
-    for i in range(0, len(snip), max_chars):
-        parts.append(snip[i : i + max_chars])
-    return parts
-
-def chunk_snippets(snippets, max_chars=2000):
-    """
-    Group file‑snippets into chunks under max_chars each.
-    Also split any individual snippet longer than max_chars.
-    """
-    chunks = []
-    current = ""
-    for snip in snippets:
-        # if snippet itself is too big, split it first:
-        if len(snip) > max_chars:
-            for part in split_long_snippet(snip, max_chars):
-                # push current if nonempty
-                if current:
-                    chunks.append(current)
-                    current = ""
-                chunks.append(part)
-        else:
-            if current and len(current) + len(snip) > max_chars:
-                chunks.append(current)
-                current = snip
-            else:
-                current += snip
-    if current:
-        chunks.append(current)
-    return chunks
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    subdirs.append(entry.path)
+            elif entry.name.endswith(EXTS) and entry.is_file():
+                yield os.path.relpath(entry.path, base_dir), entry.path
+        # Depth-first, visiting subdirectories in name order.
+        pending.extend(reversed(subdirs))
+
+def iter_text_blocks(path, block_size=READ_BLOCK):
+    """Decodes a UTF-8 file a block at a time. Raises UnicodeDecodeError like open().read()."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            text = decoder.decode(block)
+            if text:
+                yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+def file_hash(path, context_tokens=CONTEXT_TOKENS):
+    """
+    Hash of a file's contents and the chunking settings, read in blocks. Returns
+    None (after printing why) for files that cannot be read as UTF-8.
+    """
+    digest = hashlib.sha256(f"{CHUNKER_VERSION}:{context_tokens}\0".encode("utf-8"))
+    try:
+        for text in iter_text_blocks(path):
+            digest.update(text.encode("utf-8"))
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error reading {path}: {e}")
+        return None
+    return digest.hexdigest()
+
+def count_tokens(text):
+    return llm_cache.count_tokens(text, DOC_MODEL)
+
+# Fewest code tokens a chunk may hold; smaller context sizes are rejected.
+MIN_CHUNK_TOKENS = 256
+
+def chunk_budget(context_tokens=CONTEXT_TOKENS):
+    """Tokens left for code in one request after the prompts and the completion."""
+    prompts = max(count_tokens(SYSTEM_PROMPT_INITIAL), count_tokens(SYSTEM_PROMPT_EXTEND))
+    framing = 16  # chat message overhead
+    return context_tokens - prompts - count_tokens(USER_PROMPT) - MAX_COMPLETION_TOKENS - framing
+
+def _attach_comments(lines, starts):
+    """Moves each boundary up over the comment lines directly above it."""
+    moved = []
+    for start in starts:
+        while start > 0 and lines[start - 1].lstrip().startswith(("#", "//", "/*", "*", "@")):
+            start -= 1
+        moved.append(start)
+    return moved
+
+def definition_starts(rel, text, lines):
+    """Line numbers where top-level definitions (or, for other files, paragraphs) begin."""
+    if rel.endswith(PY_EXTS):
+        try:
+            tree = ast.parse(text)
+        except SyntaxError:
+            tree = None
+        if tree is not None:
+            starts = [min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])]) - 1
+                      for node in tree.body]
+            return _attach_comments(lines, starts)
+    if rel.endswith(JS_EXTS):
+        starts = [i for i, line in enumerate(lines)
+                  if line[:1] not in ("", " ", "\t", "\n", "\r", "}", ")", "]")
+                  and not line.startswith(("//", "/*", "*"))]
+        return _attach_comments(lines, starts)
+    return [i for i in range(1, len(lines)) if not lines[i - 1].strip() and lines[i].strip()]
+
+def split_definitions(rel, text):
+    """Splits a file into consecutive pieces at top-level definition boundaries."""
+    lines = text.splitlines(keepends=True)
+    bounds = sorted({0, len(lines), *definition_starts(rel, text, lines)})
+    return ["".join(lines[a:b]) for a, b in zip(bounds, bounds[1:]) if a < b]
+
+def split_to_fit(piece, limit):
+    """Splits a piece that exceeds limit tokens by lines, halving any line that is still too long."""
+    if len(piece) <= 1 or count_tokens(piece) <= limit:
+        return [piece]
+    lines = piece.splitlines(keepends=True)
+    if len(lines) == 1:
+        middle = len(piece) // 2
+        return split_to_fit(piece[:middle], limit) + split_to_fit(piece[middle:], limit)
+    middle = len(lines) // 2
+    return split_to_fit("".join(lines[:middle]), limit) + split_to_fit("".join(lines[middle:]), limit)
+
+def format_snippet(rel, text, part=0):
+    title = rel if part == 0 else f"{rel} (continued, part {part + 1})"
+    return f"\n\n# File: {title}\n```text\n{text}\n```"
+
+def iter_file_chunks(rel, path, context_tokens=CONTEXT_TOKENS):
+    """
+    Yields the file as fenced snippets, each filling up to chunk_budget() tokens.
+    Cuts fall between top-level definitions where possible (ast for Python,
+    unindented statements for JS/TS, blank lines otherwise), then between lines.
+    One file is held in memory at a time.
+    """
+    budget = chunk_budget(context_tokens)
+    frame = count_tokens(format_snippet(rel, "", part=1))
+    if budget - frame < MIN_CHUNK_TOKENS:
+        raise ValueError(f"context_tokens={context_tokens} leaves {budget - frame} tokens for code from {rel}; "
+                         f"at least {MIN_CHUNK_TOKENS} are needed")
+    text = "".join(iter_text_blocks(path))
+    pieces = []
+    for piece in split_definitions(rel, text):
+        pieces.extend(split_to_fit(piece, budget - frame))
+
+    part, current, used = 0, [], frame
+    for piece in pieces:
+        tokens = count_tokens(piece)
+        if current and used + tokens > budget:
+            yield format_snippet(rel, "".join(current), part)
+            part, current, used = part + 1, [], frame
+        current.append(piece)
+        used += tokens
+    yield format_snippet(rel, "".join(current), part)
 
 # ——— 2) PROMPTS ———
 SYSTEM_PROMPT_INITIAL = """\
@@ -89,34 +207,181 @@ Maintain Markdown format, and include Mermaid diagrams where appropriate."""
 USER_PROMPT = "Here is the next slice of code:\n\n{}"
 
 # ——— 3) CHAT LOOP ———
-def generate_incremental_markdown(chunks, max_retries=3):
-    md = ""
-    for i, chunk in enumerate(chunks):
-        retries = 0
-        while retries < max_retries:
-            try:
-                print(f"→ Processing chunk {i+1}/{len(chunks)}…")
-                sys_p = SYSTEM_PROMPT_INITIAL if i == 0 else SYSTEM_PROMPT_EXTEND
-                resp = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role":"system", "content": sys_p},
-                              {"role":"user", "content": USER_PROMPT.format(chunk)}],
-                    max_tokens=400,
-                    temperature=0.2,
-                    timeout=60  # Set a timeout for the API request
-                )
-                part = resp.choices[0].message.content
-                md += "\n\n" + part
-                break  # Exit the retry loop on success
-            except (openai.error.APIError, openai.error.APIConnectionError) as e:
-                retries += 1
-                print(f"API error: {e}. Retrying {retries}/{max_retries}...")
-                time.sleep(5)  # Wait before retrying
-            except Exception as e:
-                print(f"Unexpected error: {e}")
-                break  # Exit the loop on other errors
-        time.sleep(1.5)  # Throttle the requests to avoid rate-limiting
-    return md
+DEFAULT_CONCURRENCY = 4
+REQUESTS_PER_MINUTE = 60
+TOKENS_PER_MINUTE = 60000
+MAX_COMPLETION_TOKENS = 1024
+RETRYABLE_ERRORS = (openai.error.APIError, openai.error.APIConnectionError,
+                    openai.error.RateLimitError, openai.error.Timeout,
+                    openai.error.ServiceUnavailableError)
+
+class RateLimiter:
+    """
+    Token buckets for requests/min and tokens/min. acquire() waits until both
+    buckets hold enough capacity for one request of the given token estimate.
+    """
+    def __init__(self, requests_per_minute=REQUESTS_PER_MINUTE, tokens_per_minute=TOKENS_PER_MINUTE):
+        self.rpm = requests_per_minute
+        self.tpm = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    async def acquire(self, tokens):
+        tokens = min(tokens, self.tpm)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+                wait = max((1 - self._requests) * 60 / self.rpm,
+                           (tokens - self._tokens) * 60 / self.tpm)
+                await asyncio.sleep(wait)
+
+def estimate_tokens(messages, max_tokens=MAX_COMPLETION_TOKENS):
+    # Prompt tokens plus the completion budget.
+    return sum(count_tokens(m["content"]) for m in messages) + max_tokens
+
+async def generate_chunk_markdown(i, total, chunk, limiter, max_retries=3,
+                                  backoff_base=1.0, backoff_cap=30.0):
+    """Documents one chunk. Returns "" if it fails, matching the old sequential loop."""
+    sys_p = SYSTEM_PROMPT_INITIAL if i == 0 else SYSTEM_PROMPT_EXTEND
+    messages = [{"role":"system", "content": sys_p},
+                {"role":"user", "content": USER_PROMPT.format(chunk)}]
+    label = f"{i+1}/{total}" if total else f"{i+1}"
+
+    async def take_slot():
+        await limiter.acquire(estimate_tokens(messages))
+
+    for attempt in range(max_retries + 1):
+        try:
+            print(f"→ Processing chunk {label}…")
+            return await achat_completion_text(
+                model=DOC_MODEL,
+                messages=messages,
+                before_request=take_slot,
+                max_tokens=MAX_COMPLETION_TOKENS,
+                temperature=0.2,
+                request_timeout=60  # Set a timeout for the API request
+            )
+        except RETRYABLE_ERRORS as e:
+            if attempt == max_retries:
+                print(f"API error on chunk {i+1}: {e}. Giving up after {max_retries} retries.")
+                return ""
+            # Exponential backoff with full jitter.
+            delay = random.uniform(0, min(backoff_cap, backoff_base * 2 ** attempt))
+            print(f"API error on chunk {i+1}: {e}. Retrying {attempt+1}/{max_retries} in {delay:.1f}s...")
+            await asyncio.sleep(delay)
+        except Exception as e:
+            print(f"Unexpected error on chunk {i+1}: {e}")
+            return ""
+
+async def generate_sections_async(jobs, total=None, max_retries=3, concurrency=DEFAULT_CONCURRENCY,
+                                  requests_per_minute=REQUESTS_PER_MINUTE,
+                                  tokens_per_minute=TOKENS_PER_MINUTE):
+    """
+    Documents (index, chunk) jobs with `concurrency` workers and returns
+    {index: section}. Workers pull jobs lazily, so a generator of chunks is only
+    read as fast as requests go out.
+    """
+    limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+    jobs = iter(jobs)
+    sections = {}
+
+    async def worker():
+        for i, chunk in jobs:
+            sections[i] = await generate_chunk_markdown(i, total, chunk, limiter, max_retries)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return sections
+
+def join_sections(sections):
+    return "".join("\n\n" + part for part in sections if part)
+
+def generate_incremental_markdown(chunks, max_retries=3, concurrency=DEFAULT_CONCURRENCY,
+                                  requests_per_minute=REQUESTS_PER_MINUTE,
+                                  tokens_per_minute=TOKENS_PER_MINUTE):
+    sections = asyncio.run(generate_sections_async(
+        enumerate(chunks), len(chunks), max_retries, concurrency, requests_per_minute, tokens_per_minute
+    ))
+    # Sections are reassembled by index, so they come back in chunk order.
+    return join_sections(sections[i] for i in range(len(chunks)))
+
+# ——— 3b) INCREMENTAL MANIFEST ———
+def prompts_hash():
+    """Changes whenever the prompts change, which invalidates every stored section."""
+    text = "\0".join([SYSTEM_PROMPT_INITIAL, SYSTEM_PROMPT_EXTEND, USER_PROMPT, str(MAX_COMPLETION_TOKENS)])
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("prompts") != prompts_hash():
+        return {}
+    return manifest.get("files", {})
+
+def save_manifest(files, path=MANIFEST_PATH):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "prompts": prompts_hash(), "files": files}, f, indent=1)
+    os.replace(tmp, path)
+
+def generate_documentation(files, manifest, full=False, context_tokens=CONTEXT_TOKENS, **options):
+    """
+    Documents (rel, path) files, reusing manifest sections for files whose content
+    hash is unchanged. Each file is chunked on its own so an edit only invalidates
+    that file's chunks, and only changed files are read past their hash; their
+    chunks are produced lazily as requests go out. Returns (markdown, new manifest,
+    number of chunks reused, total). Files with a failed chunk are left out of the
+    new manifest so they are retried.
+    """
+    owners = []   # (rel, entry, first chunk index, chunk count)
+    reused = {}
+
+    def jobs():
+        index = 0
+        for rel, path in files:
+            digest = file_hash(path, context_tokens)
+            if digest is None:
+                continue
+            entry = {"hash": digest, "initial": index == 0}
+            previous = manifest.get(rel)
+            if (not full and previous and previous["hash"] == entry["hash"]
+                    and previous["initial"] == entry["initial"]):
+                for k, section in enumerate(previous["sections"]):
+                    reused[index + k] = section
+                owners.append((rel, entry, index, len(previous["sections"])))
+                index += len(previous["sections"])
+                continue
+            start = index
+            for chunk in iter_file_chunks(rel, path, context_tokens):
+                yield index, chunk
+                index += 1
+            owners.append((rel, entry, start, index - start))
+
+    sections = asyncio.run(generate_sections_async(jobs(), **options))
+    sections.update(reused)
+
+    new_manifest = {}
+    for rel, entry, start, count in owners:
+        entry["sections"] = [sections[i] for i in range(start, start + count)]
+        if all(entry["sections"]):
+            new_manifest[rel] = entry
+    markdown = join_sections(sections[i] for i in range(len(sections)))
+    return markdown, new_manifest, len(reused), len(sections)
 
 # ——— 4) SAVE MD ———
 def save_markdown(md, path):
@@ -126,8 +391,58 @@ def save_markdown(md, path):
 # ——— 5) RENDER MERMAID & BUILD DOCX ———
 MERMAID_RE = re.compile(r"```mermaid\s+([\s\S]+?)```", re.MULTILINE)
 
-def render_and_embed_mermaid(md_text, doc):
+def diagram_key(source):
+    return hashlib.sha256(source.strip().encode("utf-8")).hexdigest()
+
+def render_mermaid(source, renderer=(MMDC_PATH,), cache_dir=MERMAID_CACHE_DIR):
+    """
+    Renders one Mermaid diagram to <cache_dir>/<hash>.png unless it is already
+    there. Returns the PNG path, or None if rendering failed.
+    """
+    png = os.path.join(cache_dir, diagram_key(source) + ".png")
+    if os.path.exists(png):
+        return png
+    os.makedirs(cache_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        mmd = os.path.join(tmp, "diagram.mmd")
+        out = os.path.join(tmp, "diagram.png")
+        with open(mmd, "w", encoding="utf-8") as wf:
+            wf.write(source.strip())
+        try:
+            result = subprocess.run(
+                [*renderer, "-i", mmd, "-o", out, "-b", "transparent"],
+                check=False,  # Don't raise an exception on failure
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+        except OSError as e:
+            print(f"Error rendering Mermaid diagram: {e}")
+            return None
+        if result.returncode != 0 or not os.path.exists(out):
+            print(f"Error generating diagram: {result.stderr.decode(errors='replace')}")
+            return None
+        # Move into place in one step so a concurrent build never sees half a PNG.
+        os.replace(out, png)
+    return png
+
+def render_diagrams(sources, renderer=(MMDC_PATH,), cache_dir=MERMAID_CACHE_DIR, workers=MERMAID_WORKERS):
+    """
+    Renders every distinct diagram in parallel. Each render is its own mmdc
+    process, so a thread pool is enough to keep them all busy.
+    Returns {diagram_key: png path or None}.
+    """
+    unique = {diagram_key(src): src for src in sources}
+    if not unique:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(workers, len(unique))) as pool:
+        pngs = pool.map(lambda src: render_mermaid(src, renderer, cache_dir), unique.values())
+        return dict(zip(unique, pngs))
+
+def render_and_embed_mermaid(md_text, doc, renderer=(MMDC_PATH,), cache_dir=MERMAID_CACHE_DIR,
+                             workers=MERMAID_WORKERS):
     parts = MERMAID_RE.split(md_text)
+    # Odd parts are Mermaid sources; render them all before assembling the DOCX.
+    pngs = render_diagrams(parts[1::2], renderer, cache_dir, workers)
     diagram_count = 1
     for idx, chunk in enumerate(parts):
         if idx % 2 == 0:
@@ -143,61 +458,50 @@ def render_and_embed_mermaid(md_text, doc):
                     doc.add_paragraph(txt)
         else:
             # this is a Mermaid block
-            mmd = os.path.join(PROJECT_ROOT, f"__tmp_{idx}.mmd")  # Absolute path
-            png = os.path.join(PROJECT_ROOT, f"__diag_{idx}.png")  # Absolute path
-            try:
-                with open(mmd, "w", encoding="utf-8") as wf:
-                    wf.write(chunk.strip())
-
-                # Run mermaid CLI to generate the PNG
-                result = subprocess.run(
-                    [MMDC_PATH, "-i", mmd, "-o", png, "-b", "transparent"],
-                    check=False,  # Don't raise an exception on failure
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
-
-                # Check if there were errors during diagram generation
-                if result.returncode != 0:
-                    print(f"Error generating diagram {diagram_count}: {result.stderr.decode()}")
-                    continue  # Skip this diagram if rendering fails
-                
-                # Ensure the PNG file is generated before adding it to the DOCX
-                if os.path.exists(png):
-                    # Add the diagram to the DOCX
-                    doc.add_paragraph()
-                    doc.add_picture(png, width=Inches(6))
-                    doc.add_paragraph(f"Figure {diagram_count}: Diagram")
-                else:
-                    print(f"PNG file for diagram {diagram_count} was not generated.")
-
-            except subprocess.CalledProcessError as e:
-                print(f"Error rendering Mermaid diagram: {e}")
-            except Exception as e:
-                print(f"Unexpected error: {e}")
-            finally:
-                # Clean up the temporary files
-                if os.path.exists(mmd):
-                    os.remove(mmd)
-                if os.path.exists(png):
-                    os.remove(png)
-            diagram_count += 1
-
-def build_docx(md_path, docx_path):
+            png = pngs.get(diagram_key(chunk))
+            if png:
+                doc.add_paragraph()
+                doc.add_picture(png, width=Inches(6))
+                doc.add_paragraph(f"Figure {diagram_count}: Diagram")
+                diagram_count += 1
+            else:
+                print(f"Skipping diagram {diagram_count}: it could not be rendered.")
+
+def build_docx(md_path, docx_path, renderer=(MMDC_PATH,), cache_dir=MERMAID_CACHE_DIR):
     md = open(md_path, encoding="utf-8").read()
     doc = Document()
     doc.add_heading("Project Documentation", 0)
-    render_and_embed_mermaid(md, doc)
+    render_and_embed_mermaid(md, doc, renderer, cache_dir)
     doc.save(docx_path)
 
 # ——— MAIN ———
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate DOCUMENTATION.md/.docx from the source tree.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="chunk requests in flight at once")
+    parser.add_argument("--rpm", type=int, default=REQUESTS_PER_MINUTE, help="max requests per minute")
+    parser.add_argument("--tpm", type=int, default=TOKENS_PER_MINUTE, help="max tokens per minute")
+    parser.add_argument("--context-tokens", type=int, default=CONTEXT_TOKENS,
+                        help="tokens per request the chunker fills up to (prompts + code + completion)")
+    parser.add_argument("--full", action="store_true",
+                        help="ignore the manifest and regenerate every chunk")
+    args = parser.parse_args()
+    # Twice the minimum leaves room for the "# File: ..." frame of long paths.
+    if chunk_budget(args.context_tokens) < 2 * MIN_CHUNK_TOKENS:
+        parser.error(f"--context-tokens {args.context_tokens} leaves {chunk_budget(args.context_tokens)} tokens "
+                     f"for code after the prompts and completion; use at least "
+                     f"{args.context_tokens - chunk_budget(args.context_tokens) + 2 * MIN_CHUNK_TOKENS}")
+
     print(" Collecting source snippets…")
-    snippets = collect_file_snippets(PROJECT_ROOT)
-    chunks   = chunk_snippets(snippets)
+    sources = iter_source_files(PROJECT_ROOT)
 
     print(" Generating documentation in Markdown…")
-    markdown = generate_incremental_markdown(chunks)
+    manifest = load_manifest()
+    markdown, manifest, skipped, total = generate_documentation(
+        sources, manifest, full=args.full, context_tokens=args.context_tokens, concurrency=args.concurrency,
+        requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+    print(f" Skipped {skipped} of {total} chunks (unchanged since the last run)")
+    save_manifest(manifest)
 
     print(f" Writing Markdown to {OUTPUT_MD}")
     save_markdown(markdown, OUTPUT_MD)
@@ -0,0 +1,111 @@
+"""
+Incremental JSON scanner for streamed LLM output.
+
+Text is fed in arbitrary pieces as it arrives. Whenever a value whose path is
+wanted becomes syntactically complete, it is decoded and returned together with
+its path, e.g. ("tasks", 0, "tasks", 1, "subtasks", 2) for the third subtask of
+the second task of the first category. Anything before the first "{" (such as a
+stray sentence or a ```json fence) and after the root object closes is ignored.
+"""
+import json
+
+WHITESPACE = " \t\r\n"
+SCALAR_END = ",}]" + WHITESPACE
+
+
+class IncrementalJSONParser:
+    def __init__(self, want):
+        self.want = want          # callable(path) -> bool
+        self.text = ""
+        self._pos = 0
+        # One frame per open container: [kind, start, path, key_or_index, expect_key]
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._string_is_key = False
+        self._scalar_start = None
+        self._value_path = None
+        self._started = False
+        self.done = False
+
+    def _child_path(self):
+        if not self._stack:
+            return ()
+        frame = self._stack[-1]
+        return frame[2] + (frame[3],)
+
+    def _finish(self, path, start, end, out):
+        if self.want(path):
+            out.append((path, json.loads(self.text[start:end])))
+
+    def feed(self, piece):
+        """Consumes more text and returns the (path, value) pairs it completed."""
+        self.text += piece
+        out = []
+        text = self.text
+        i = self._pos
+        while i < len(text) and not self.done:
+            c = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._string_is_key:
+                        frame = self._stack[-1]
+                        frame[3] = json.loads(text[self._string_start:i + 1])
+                        frame[4] = False
+                    else:
+                        self._finish(self._value_path, self._string_start, i + 1, out)
+                i += 1
+                continue
+
+            if self._scalar_start is not None:
+                if c not in SCALAR_END:
+                    i += 1
+                    continue
+                self._finish(self._value_path, self._scalar_start, i, out)
+                self._scalar_start = None
+                # fall through: the delimiter itself still needs handling
+
+            if not self._started:
+                if c == "{":
+                    self._started = True
+                else:
+                    i += 1
+                    continue
+
+            if c in WHITESPACE or c == ":":
+                pass
+            elif c == '"':
+                self._in_string = True
+                self._string_start = i
+                top = self._stack[-1] if self._stack else None
+                self._string_is_key = bool(top and top[0] == "object" and top[4])
+                if not self._string_is_key:
+                    self._value_path = self._child_path()
+            elif c in "{[":
+                kind = "object" if c == "{" else "array"
+                self._stack.append([kind, i, self._child_path(), None if kind == "object" else 0, True])
+            elif c in "}]":
+                kind, start, path, _, _ = self._stack.pop()
+                self._finish(path, start, i + 1, out)
+                if not self._stack:
+                    self.done = True
+            elif c == ",":
+                top = self._stack[-1]
+                if top[0] == "array":
+                    top[3] += 1
+                else:
+                    top[4] = True
+            else:
+                self._scalar_start = i
+                self._value_path = self._child_path()
+            i += 1
+
+        self._pos = i
+        return out
@@ -0,0 +1,236 @@
+"""
+Content-addressed cache for chat completions.
+
+Responses are keyed on a hash of everything that shapes the completion (model,
+messages, temperature and any other request parameters). Lookups go through an
+in-process LRU with a TTL and a byte budget first, then an on-disk SQLite store
+that survives restarts and is shared by every script in this directory.
+
+    content = chat_completion_text(model="gpt-3.5-turbo", messages=[...], temperature=0)
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import openai
+
+try:
+    import tiktoken
+except ImportError:  # token counts fall back to a characters-per-token estimate
+    tiktoken = None
+
+DEFAULT_PATH = os.getenv(
+    "LLM_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".llm_cache.sqlite")
+)
+DEFAULT_TTL = int(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600))  # seconds
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+# Seconds a disk lookup or write waits for another process's lock before it is
+# skipped; the cache is best effort, so a short wait beats stalling a request.
+BUSY_TIMEOUT = float(os.getenv("LLM_CACHE_BUSY_TIMEOUT", 0.5))
+# Request options that do not change the completion and so stay out of the key.
+TRANSPORT_PARAMS = {"timeout", "request_timeout"}
+CHARS_PER_TOKEN = 4
+
+
+def make_key(model, messages, **params):
+    payload = json.dumps({"model": model, "messages": messages, **params},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def request_key(model, messages, **params):
+    """Cache key for a chat completion request, ignoring transport-only options."""
+    return make_key(model, messages, **{k: v for k, v in params.items()
+                                        if k not in TRANSPORT_PARAMS and k != "stream"})
+
+
+_encodings = {}
+
+
+def get_encoding(model):
+    """tiktoken encoding for model, or None if tiktoken or its BPE file is unavailable."""
+    if model not in _encodings:
+        _encodings[model] = None
+        if tiktoken is not None:
+            try:
+                _encodings[model] = tiktoken.encoding_for_model(model)
+            except Exception as e:  # unknown model, or the BPE file cannot be downloaded
+                print(f"tiktoken unavailable for {model} ({e}); estimating tokens from characters",
+                      file=sys.stderr)
+    return _encodings[model]
+
+
+def count_tokens(text, model="gpt-3.5-turbo"):
+    """Tokens in text for model; ~4 characters per token when tiktoken is unavailable."""
+    encoding = get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+class LLMCache:
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL,
+                 max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()  # key -> (stored_at, value)
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0,
+                          "write_errors": 0}
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+            # WAL lets readers in other processes proceed while one of them writes.
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            try:
+                self._db.execute("DELETE FROM llm_cache WHERE stored_at < ?", (time.time() - ttl,))
+                self._db.commit()
+            except sqlite3.Error as e:  # another process holds the lock; expire next time
+                self._db.rollback()
+                print(f"LLM cache cleanup skipped ({e})", file=sys.stderr)
+
+    def _remember(self, key, stored_at, value):
+        """Puts a value in the LRU and evicts least-recently-used entries over budget."""
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key)[1])
+        self._memory[key] = (stored_at, value)
+        self._memory_bytes += len(value)
+        while self._memory and (len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes):
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._counters["evictions"] += 1
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return entry[1]
+                self._memory_bytes -= len(self._memory.pop(key)[1])
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value, stored_at FROM llm_cache WHERE key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error as e:  # e.g. locked by another process: treat as a miss
+                    print(f"LLM cache read failed ({e})", file=sys.stderr)
+                    row = None
+                if row is not None and now - row[1] <= self.ttl:
+                    self._remember(key, row[1], row[0])
+                    self._counters["disk_hits"] += 1
+                    return row[0]
+
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+            self._counters["stores"] += 1
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO llm_cache (key, value, stored_at) VALUES (?, ?, ?)",
+                        (key, value, now),
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:  # the answer is still cached in memory and returned
+                    self._db.rollback()
+                    self._counters["write_errors"] += 1
+                    print(f"LLM cache write failed ({e})", file=sys.stderr)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._memory)
+            stats["memory_bytes"] = self._memory_bytes
+            if self._db is not None:
+                try:
+                    stats["disk_entries"] = self._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+                except sqlite3.Error:
+                    stats["disk_entries"] = None
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache()
+        return _default_cache
+
+
+def is_json_object(content):
+    """validate= helper for chat_completion_text: only cache answers that are a JSON object."""
+    try:
+        return isinstance(json.loads(content), dict)
+    except ValueError:
+        return False
+
+
+def chat_completion_text(model, messages, cache=None, validate=None, **params):
+    """
+    Returns the message content of a chat completion, served from the cache when
+    an identical request was answered before. API errors propagate unchanged.
+    If validate is given, only content for which validate(content) is truthy is
+    stored, so a malformed answer is retried on the next call instead of replayed.
+    """
+    cache = cache or get_default_cache()
+    key = request_key(model, messages, **params)
+    content = cache.get(key)
+    if content is not None:
+        return content
+
+    response = openai.ChatCompletion.create(model=model, messages=messages, **params)
+    content = response["choices"][0]["message"]["content"].strip()
+    if validate is None or validate(content):
+        cache.set(key, content)
+    return content
+
+
+async def achat_completion_text(model, messages, cache=None, validate=None, before_request=None, **params):
+    """
+    Async counterpart of chat_completion_text using openai.ChatCompletion.acreate.
+    before_request, if given, is awaited only when the request misses the cache
+    (e.g. to take a rate-limiter slot). Cache lookups and writes run in a thread,
+    so a slow or locked SQLite file never blocks the event loop.
+    """
+    cache = cache or await asyncio.to_thread(get_default_cache)
+    key = request_key(model, messages, **params)
+    content = await asyncio.to_thread(cache.get, key)
+    if content is not None:
+        return content
+
+    if before_request is not None:
+        await before_request()
+    response = await openai.ChatCompletion.acreate(model=model, messages=messages, **params)
+    content = response["choices"][0]["message"]["content"].strip()
+    if validate is None or validate(content):
+        await asyncio.to_thread(cache.set, key, content)
+    return content
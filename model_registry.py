@@ -0,0 +1,217 @@
+"""
+In-memory registry of the performance models used by model_service and model_tasks.
+
+A version is either a pickled sklearn model or a directory written by
+compiled_forest.export_forest (watched through its forest.json manifest); the
+compiled forest is served by default when it sits next to the pickle. The
+Pareto-optimal forests from `model_step1.py --search` are registered under their
+own names (e.g. ?model=rf-50-d10), and with MODEL_LATENCY_BUDGET_MS set the
+default becomes the most accurate compiled forest whose measured single-row
+latency fits the budget (chosen at startup from the manifests' metadata).
+
+Each named version is loaded once and kept in memory. get() re-stats the file
+at most every MODEL_CHECK_INTERVAL seconds; when its mtime or size changed and the
+SHA-256 of its contents differs, the new model is loaded on a background thread
+and the version's entry is replaced in one assignment. Callers hold on to the
+entry they got, so predictions already running finish on the old model while new
+calls see the new one, and a half-written or broken file leaves the old model serving.
+
+    from model_registry import registry
+    entry = registry.get()              # the "default" version
+    entry.model.predict(matrix)
+
+Extra versions come from MODEL_VERSIONS ("name=path,name=path") or register().
+"""
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import namedtuple
+
+from compiled_forest import MANIFEST_NAME, forest_path, load_forest, read_manifest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VERSION = "default"
+SKLEARN_VERSION = "sklearn"
+PICKLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "employee_performance_model.pkl")
+COMPILED_PATH = forest_path(PICKLE_PATH)
+CANDIDATES_DIR = os.path.splitext(PICKLE_PATH)[0] + ".candidates"
+MODEL_LATENCY_BUDGET_MS = os.getenv("MODEL_LATENCY_BUDGET_MS")
+MODEL_CHECK_INTERVAL = float(os.getenv("MODEL_CHECK_INTERVAL", 2))  # seconds, 0 checks on every get()
+
+LoadedModel = namedtuple("LoadedModel", "name path model sha256 mtime size loaded_at")
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def watched_file(path):
+    """The file whose changes mean the model at path changed."""
+    return os.path.join(path, MANIFEST_NAME) if os.path.isdir(path) else path
+
+
+def load_model(path):
+    if os.path.isdir(path):
+        return load_forest(path)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def candidate_paths(directory=CANDIDATES_DIR):
+    """{name: path} of the compiled forests written by model_step1 --search."""
+    if not os.path.isdir(directory):
+        return {}
+    return {
+        entry.name[:-len(".forest")]: entry.path
+        for entry in sorted(os.scandir(directory), key=lambda entry: entry.name)
+        if entry.name.endswith(".forest") and entry.is_dir()
+    }
+
+
+def choose_artifact(paths, budget_ms):
+    """
+    The compiled forest with the best CV (else test) R² whose latency_ms_per_row
+    fits budget_ms, or the fastest one if none does. None if no manifest has metadata.
+    """
+    measured = []
+    for path in paths:
+        try:
+            metadata = read_manifest(path).get("metadata") or {}
+        except (OSError, ValueError):
+            continue
+        score = metadata.get("cv_r2", metadata.get("test_r2"))
+        if score is not None and "latency_ms_per_row" in metadata:
+            measured.append((path, score, metadata["latency_ms_per_row"]))
+    if not measured:
+        return None
+    fitting = [m for m in measured if m[2] <= budget_ms]
+    if fitting:
+        return max(fitting, key=lambda m: (m[1], -m[2]))[0]
+    return min(measured, key=lambda m: m[2])[0]
+
+
+def default_model_path():
+    if os.getenv("MODEL_PATH"):
+        return os.getenv("MODEL_PATH")
+    compiled = [COMPILED_PATH] if os.path.isdir(COMPILED_PATH) else []
+    if MODEL_LATENCY_BUDGET_MS:
+        chosen = choose_artifact(compiled + list(candidate_paths().values()), float(MODEL_LATENCY_BUDGET_MS))
+        if chosen:
+            return chosen
+    return compiled[0] if compiled else PICKLE_PATH
+
+
+def parse_versions(spec):
+    """ "name=path,name=path" -> {name: path}; blank entries are ignored."""
+    versions = {}
+    for item in (spec or "").split(","):
+        name, sep, path = item.partition("=")
+        if sep and name.strip() and path.strip():
+            versions[name.strip()] = path.strip()
+    return versions
+
+
+class ModelRegistry:
+    def __init__(self, check_interval=MODEL_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._paths = {}      # name -> path
+        self._entries = {}    # name -> LoadedModel, replaced wholesale on reload
+        self._checked = {}    # name -> monotonic time of the last stat
+        self._locks = {}      # name -> lock held only while (re)loading that version
+        self._lock = threading.Lock()
+
+    def register(self, name, path):
+        """Adds (or repoints) a named version; it is loaded on its first get()."""
+        with self._lock:
+            self._paths[name] = os.path.abspath(path)
+            self._locks.setdefault(name, threading.Lock())
+            self._checked.pop(name, None)
+
+    def names(self):
+        return sorted(self._paths)
+
+    def get(self, name=DEFAULT_VERSION):
+        """
+        The current LoadedModel for name. Raises KeyError for an unknown version and
+        the load error if the version has never been loaded successfully.
+        """
+        if name not in self._paths:
+            raise KeyError(f"Unknown model version {name!r}.")
+        entry = self._entries.get(name)
+        if entry is None:
+            with self._locks[name]:  # first load: every caller has to wait for it
+                entry = self._entries.get(name)
+                if entry is None:
+                    entry = self._reload(name, None)
+            return entry
+        if time.monotonic() - self._checked.get(name, 0) >= self.check_interval:
+            # Whoever wins the lock checks the file; everyone else keeps serving.
+            lock = self._locks[name]
+            if lock.acquire(blocking=False):
+                if self._changed(name, entry):
+                    # The lock passes to the loader thread, so this call is not delayed either.
+                    threading.Thread(target=self._reload_in_background, args=(name, entry, lock),
+                                     name=f"model-reload-{name}", daemon=True).start()
+                else:
+                    lock.release()
+        return entry
+
+    def info(self):
+        """Metadata of every loaded version, for status endpoints."""
+        return {
+            name: {"path": entry.path, "sha256": entry.sha256, "mtime": entry.mtime,
+                   "loaded_at": entry.loaded_at, "metadata": getattr(entry.model, "metadata", None)}
+            for name, entry in sorted(self._entries.items())
+        }
+
+    def _changed(self, name, entry):
+        self._checked[name] = time.monotonic()
+        try:
+            stat = os.stat(watched_file(self._paths[name]))
+        except OSError as e:
+            logger.warning("Model %s: cannot stat %s (%s); keeping the loaded model", name, entry.path, e)
+            return False
+        return self._paths[name] != entry.path or (stat.st_mtime, stat.st_size) != (entry.mtime, entry.size)
+
+    def _reload_in_background(self, name, entry, lock):
+        try:
+            self._reload(name, entry)
+        except Exception as e:
+            logger.warning("Model %s: reload of %s failed (%s); keeping the loaded model",
+                           name, self._paths[name], e)
+        finally:
+            lock.release()
+
+    def _reload(self, name, entry):
+        path = self._paths[name]
+        stat = os.stat(watched_file(path))
+        sha256 = file_sha256(watched_file(path))
+        if entry is not None and entry.sha256 == sha256:
+            # Touched or rewritten with the same bytes: keep the unpickled model.
+            new = entry._replace(path=path, mtime=stat.st_mtime, size=stat.st_size)
+        else:
+            model = load_model(path)
+            new = LoadedModel(name, path, model, sha256, stat.st_mtime, stat.st_size, time.time())
+            logger.info("Model %s: loaded %s (sha256 %s)", name, path, sha256[:12])
+        self._entries[name] = new
+        self._checked[name] = time.monotonic()
+        return new
+
+
+DEFAULT_MODEL_PATH = default_model_path()
+registry = ModelRegistry()
+registry.register(DEFAULT_VERSION, DEFAULT_MODEL_PATH)
+for _name, _path in candidate_paths().items():
+    registry.register(_name, _path)
+if DEFAULT_MODEL_PATH != PICKLE_PATH and os.path.exists(PICKLE_PATH):
+    registry.register(SKLEARN_VERSION, PICKLE_PATH)  # ?model=sklearn, for comparing against the original
+for _name, _path in parse_versions(os.getenv("MODEL_VERSIONS")).items():
+    registry.register(_name, _path)
@@ -1,12 +1,112 @@
-import pickle
-import pandas as pd
+import os
+import queue
+import threading
+import time
+import warnings
+from concurrent.futures import Future
+
+import numpy as np
 from flask import Flask, request, jsonify
 
+from model_registry import DEFAULT_VERSION, registry
+
 app = Flask(__name__)
 
-# 1️⃣ Load your trained model on startup
-with open("employee_performance_model.pkl", "rb") as f:
-    model = pickle.load(f)
+# 1️⃣ Load your trained model on startup (model_registry hot-reloads it when the file changes)
+registry.get()
+
+# Rows are scored as plain arrays in this column order, so the model's
+# "fitted with feature names" warning does not apply.
+FEATURES = list(getattr(registry.get().model, "feature_names_in_", [
+    "total_assignments", "completed_assignments", "completion_ratio", "feedback_count",
+]))
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+# Single-row requests arriving within MICRO_BATCH_WAIT_MS of each other are
+# scored together in one predict call (0 disables micro-batching).
+MICRO_BATCH_WAIT_MS = float(os.getenv("MICRO_BATCH_WAIT_MS", 2))
+MICRO_BATCH_MAX = int(os.getenv("MICRO_BATCH_MAX", 256))
+MAX_BATCH_ROWS = 10000
+
+
+def rows_to_matrix(rows):
+    """Feature rows (dicts) to a float array in FEATURES order. Raises ValueError on a bad row."""
+    matrix = np.empty((len(rows), len(FEATURES)), dtype=np.float64)
+    for i, row in enumerate(rows):
+        if not isinstance(row, dict):
+            raise ValueError(f"Row {i} is not an object.")
+        try:
+            matrix[i] = [row[name] for name in FEATURES]
+        except KeyError as e:
+            raise ValueError(f"Row {i} is missing feature {e.args[0]!r}.")
+        except (TypeError, ValueError):
+            raise ValueError(f"Row {i} has a non-numeric feature value.")
+    return matrix
+
+
+def predict_matrix(matrix, version=DEFAULT_VERSION):
+    # Fetched per call: a hot reload swaps the entry, this call keeps the model it got.
+    return registry.get(version).model.predict(matrix)
+
+
+def predict_rows(rows, version=DEFAULT_VERSION):
+    return predict_matrix(rows_to_matrix(rows), version).tolist()
+
+
+class MicroBatcher:
+    """
+    Merges concurrent single-row predictions into one vectorized predict call.
+
+    submit() queues one feature vector and returns a Future. A background thread
+    takes the first waiting vector, keeps collecting for up to max_wait seconds
+    (or until max_batch vectors), scores them with one predict_fn(matrix) call
+    and resolves each Future.
+    """
+
+    def __init__(self, predict_fn, max_wait=MICRO_BATCH_WAIT_MS / 1000, max_batch=MICRO_BATCH_MAX):
+        self.predict_fn = predict_fn
+        self.max_wait = max_wait
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, vector):
+        future = Future()
+        self._queue.put((vector, future))
+        return future
+
+    def predict(self, vector):
+        return self.submit(vector).result()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                predictions = self.predict_fn(np.vstack([vector for vector, _ in batch]))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), prediction in zip(batch, predictions):
+                future.set_result(prediction)
+
+
+batcher = MicroBatcher(predict_matrix) if MICRO_BATCH_WAIT_MS > 0 else None
+
 
 @app.route("/api/predict", methods=["POST", "GET"])
 def predict():
@@ -16,14 +116,40 @@ def predict():
         data = request.get_json()
         if not data:
             return jsonify({"error": "No JSON data provided."}), 400
-        df = pd.DataFrame([data])
-        prediction = model.predict(df)[0]
+        version = request.args.get("model", DEFAULT_VERSION)
+        vector = rows_to_matrix([data])
+        if batcher is not None and version == DEFAULT_VERSION:
+            prediction = batcher.predict(vector[0])
+        else:
+            prediction = predict_matrix(vector, version)[0]
         return jsonify({"prediction": float(prediction)})
     except Exception as e:
         print("❌ Error during prediction:", e)
         return jsonify({"error": str(e)}), 400
 
 
+@app.route("/api/predict/batch", methods=["POST"])
+def predict_batch():
+    """Scores {"rows": [features, ...]} (or a bare list) in one predict call; ?model= picks a version."""
+    try:
+        data = request.get_json()
+        rows = data.get("rows") if isinstance(data, dict) else data
+        if not isinstance(rows, list) or not rows:
+            return jsonify({"error": "Expected a non-empty 'rows' array."}), 400
+        if len(rows) > MAX_BATCH_ROWS:
+            return jsonify({"error": f"At most {MAX_BATCH_ROWS} rows per request."}), 400
+        return jsonify({"predictions": predict_rows(rows, request.args.get("model", DEFAULT_VERSION))})
+    except Exception as e:
+        print("❌ Error during batch prediction:", e)
+        return jsonify({"error": str(e)}), 400
+
+
+@app.route("/api/models", methods=["GET"])
+def list_models():
+    """Registered model versions and the file hash each one is serving."""
+    return jsonify({"versions": registry.names(), "loaded": registry.info()})
+
+
 if __name__ == "__main__":
     # 4️⃣ Start the Flask service (choose a port, e.g. 5001)
     app.run(host="0.0.0.0", port=5001, debug=True)
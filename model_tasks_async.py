@@ -0,0 +1,314 @@
+"""
+Async serving mode for the model_tasks API.
+
+Serves the same endpoints as model_tasks.py from an aiohttp application, so a
+slow OpenAI call only suspends a coroutine instead of holding a worker thread:
+hundreds of in-flight preview requests share one process. Completions go
+through llm_cache.achat_completion_text / openai.ChatCompletion.acreate on one
+pooled aiohttp client session per worker; database work (one project lookup,
+the confirm insert) runs on a small thread pool sized to db.py's connection
+pool, so it never waits on the event loop or overruns the pool.
+
+Launcher (pre-binds the socket and forks WORKERS processes that share it,
+restarting any that die):
+
+    python model_tasks_async.py --port 5002 --workers 4
+
+    MODEL_TASKS_HOST      0.0.0.0
+    MODEL_TASKS_PORT      5002
+    MODEL_TASKS_WORKERS   1      worker processes
+    MODEL_TASKS_BACKLOG   1024   listen backlog
+    LLM_MAX_CONNECTIONS   200    concurrent connections to the OpenAI API per worker
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+import openai
+from aiohttp import web
+
+import db
+import model_tasks
+from incremental_json import IncrementalJSONParser
+from llm_cache import achat_completion_text, get_default_cache, is_json_object, request_key
+from model_tasks import PREVIEW_MODEL, preview_events, preview_item_kind
+
+HOST = os.getenv("MODEL_TASKS_HOST", "0.0.0.0")
+PORT = int(os.getenv("MODEL_TASKS_PORT", 5002))
+WORKERS = int(os.getenv("MODEL_TASKS_WORKERS", 1))
+BACKLOG = int(os.getenv("MODEL_TASKS_BACKLOG", 1024))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 200))
+
+DB_EXECUTOR = web.AppKey("db_executor", ThreadPoolExecutor)
+LLM_SESSION = web.AppKey("llm_session", aiohttp.ClientSession)
+
+
+def _in_session(fn, *args):
+    with db.session_scope():  # the executor thread's session goes back to the pool
+        return fn(*args)
+
+
+async def run_db(app, fn, *args):
+    """Runs fn(*args) on the app's DB thread pool and releases that thread's session."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(app[DB_EXECUTOR], _in_session, fn, *args)
+
+# ----------------------------
+# Async Task Generation
+# ----------------------------
+
+async def agenerate_tasks_preview(app, project_id, user_feedback=""):
+    """Async counterpart of model_tasks.generate_tasks_preview, with the same payloads."""
+    messages = await run_db(app, model_tasks.preview_messages, project_id, user_feedback)
+    if messages is None:
+        return {"error": "Project not found"}
+
+    try:
+        response_content = await achat_completion_text(
+            model=PREVIEW_MODEL,
+            messages=messages,
+            temperature=0,
+            validate=is_json_object,
+        )
+    except Exception as api_err:
+        return {"error": f"OpenAI API error: {str(api_err)}"}
+
+    try:
+        return json.loads(response_content)
+    except json.JSONDecodeError as je:
+        return {
+            "error": "Invalid JSON response from OpenAI",
+            "raw_response": response_content,
+            "exception": str(je)
+        }
+
+
+async def agenerate_tasks_preview_stream(app, project_id, user_feedback=""):
+    """Async counterpart of model_tasks.generate_tasks_preview_stream; yields the same (event, data) pairs."""
+    messages = await run_db(app, model_tasks.preview_messages, project_id, user_feedback)
+    if messages is None:
+        yield "error", {"error": "Project not found"}
+        return
+
+    cache = await asyncio.to_thread(get_default_cache)
+    key = request_key(PREVIEW_MODEL, messages, temperature=0)
+    parser = IncrementalJSONParser(lambda path: preview_item_kind(path) is not None)
+
+    # Cache I/O runs in a thread: the SQLite file may be locked by another worker.
+    response_content = await asyncio.to_thread(cache.get, key)
+    from_cache = response_content is not None
+    if from_cache:
+        for item in preview_events(parser, response_content):
+            yield item
+    else:
+        try:
+            stream = await openai.ChatCompletion.acreate(
+                model=PREVIEW_MODEL,
+                messages=messages,
+                temperature=0,
+                stream=True,
+            )
+            pieces = []
+            async for chunk in stream:
+                piece = chunk["choices"][0]["delta"].get("content")
+                if piece:
+                    pieces.append(piece)
+                    for item in preview_events(parser, piece):
+                        yield item
+        except Exception as api_err:
+            yield "error", {"error": f"OpenAI API error: {str(api_err)}"}
+            return
+        response_content = "".join(pieces).strip()
+
+    try:
+        preview_data = json.loads(response_content)
+    except json.JSONDecodeError as je:
+        yield "error", {
+            "error": "Invalid JSON response from OpenAI",
+            "raw_response": response_content,
+            "exception": str(je)
+        }
+        return
+    if not from_cache:
+        await asyncio.to_thread(cache.set, key, response_content)
+    yield "done", preview_data
+
+
+def predict_one(data, version):
+    # pandas and the model registry load on first use only, as in model_tasks.test_prediction.
+    import pandas as pd
+    from model_registry import registry
+
+    try:
+        model = registry.get(version).model
+    except Exception as e:
+        return {"error": "Failed to load model", "exception": str(e)}, 500
+    try:
+        return {"prediction": float(model.predict(pd.DataFrame([data]))[0])}, 200
+    except Exception as e:
+        return {"error": "Prediction error", "exception": str(e)}, 500
+
+# ----------------------------
+# aiohttp App & API Endpoints
+# ----------------------------
+routes = web.RouteTableDef()
+
+
+@routes.get("/api/generate-tasks-preview")
+async def generate_tasks_preview_api(request):
+    project_id = request.query.get("project_id")
+    user_feedback = request.query.get("feedback", "")
+    if not project_id:
+        return web.json_response({"error": "project_id is required"}, status=400)
+    preview = await agenerate_tasks_preview(request.app, project_id, user_feedback)
+    return web.json_response(preview)
+
+
+@routes.get("/api/generate-tasks-preview/stream")
+async def generate_tasks_preview_stream_api(request):
+    """Server-Sent Events version of /api/generate-tasks-preview."""
+    project_id = request.query.get("project_id")
+    user_feedback = request.query.get("feedback", "")
+    if not project_id:
+        return web.json_response({"error": "project_id is required"}, status=400)
+
+    response = web.StreamResponse(headers={
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+    await response.prepare(request)
+    async for event, data in agenerate_tasks_preview_stream(request.app, project_id, user_feedback):
+        await response.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+    await response.write_eof()
+    return response
+
+
+@routes.post("/api/confirm-tasks")
+async def confirm_tasks_api(request):
+    data = await request.json()
+    project_id = data.get("project_id")
+    tasks_preview = data.get("tasks")
+    if not project_id or not tasks_preview:
+        return web.json_response({"error": "project_id and tasks are required"}, status=400)
+    result = await run_db(request.app, model_tasks.confirm_tasks_in_db, tasks_preview, project_id)
+    return web.json_response(result)
+
+
+@routes.get("/api/llm-cache/stats")
+async def llm_cache_stats_api(request):
+    cache = await asyncio.to_thread(get_default_cache)
+    return web.json_response(await asyncio.to_thread(cache.stats))
+
+
+@routes.get("/api/db/pool-stats")
+async def db_pool_stats_api(request):
+    return web.json_response(db.pool_stats())
+
+
+@routes.post("/api/test-prediction")
+async def test_prediction(request):
+    from model_registry import DEFAULT_VERSION
+
+    data = await request.json()
+    loop = asyncio.get_running_loop()
+    payload, status = await loop.run_in_executor(
+        None, predict_one, data, request.query.get("model", DEFAULT_VERSION))
+    return web.json_response(payload, status=status)
+
+
+@web.middleware
+async def llm_session_middleware(request, handler):
+    # openai.aiosession is a context variable, so this only affects the current request's task.
+    openai.aiosession.set(request.app[LLM_SESSION])
+    return await handler(request)
+
+
+async def _resources(app):
+    app[DB_EXECUTOR] = ThreadPoolExecutor(db.POOL_SIZE + db.MAX_OVERFLOW, thread_name_prefix="db")
+    app[LLM_SESSION] = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=LLM_MAX_CONNECTIONS))
+    yield
+    await app[LLM_SESSION].close()
+    app[DB_EXECUTOR].shutdown(wait=True)
+
+
+def create_app():
+    app = web.Application(middlewares=[llm_session_middleware])
+    app.add_routes(routes)
+    app.cleanup_ctx.append(_resources)
+    return app
+
+# ----------------------------
+# Launcher
+# ----------------------------
+
+def bind_socket(host, port, backlog=BACKLOG):
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def serve(sock):
+    """Runs one worker on an already listening socket until SIGINT/SIGTERM."""
+    db.engine.dispose(close=False)  # never reuse connections inherited from the parent
+    web.run_app(create_app(), sock=sock, print=None, access_log=None)
+
+
+def run_workers(sock, workers):
+    """Forks workers sharing sock, restarts any that exit, and stops them all on SIGINT/SIGTERM."""
+    context = multiprocessing.get_context("fork")
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    def spawn():
+        proc = context.Process(target=serve, args=(sock,), daemon=False)
+        proc.start()
+        return proc
+
+    procs = [spawn() for _ in range(workers)]
+    while not stopping:
+        time.sleep(0.5)
+        for i, proc in enumerate(procs):
+            if not proc.is_alive() and not stopping:
+                print(f"worker {proc.pid} exited with {proc.exitcode}; restarting")
+                procs[i] = spawn()
+    for proc in procs:
+        proc.terminate()
+    for proc in procs:
+        proc.join(10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Async (aiohttp) server for the model_tasks API.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--backlog", type=int, default=BACKLOG)
+    args = parser.parse_args()
+
+    sock = bind_socket(args.host, args.port, args.backlog)
+    print(f"model_tasks async API on http://{args.host}:{args.port} with {args.workers} worker(s)")
+    if args.workers <= 1:
+        serve(sock)
+    else:
+        run_workers(sock, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -107,7 +107,15 @@ const Assignment = sequelize.define(
     employee_id: { type: DataTypes.INTEGER, allowNull: false, references: { model: "employee_details", key: "employee_id" } },
     status: { type: DataTypes.INTEGER, defaultValue: 0 },
   },
-  { tableName: "assignments", timestamps: true }
+  {
+    tableName: "assignments",
+    timestamps: true,
+    // Backs the assigner's NOT EXISTS lookups (see db_migrations.py).
+    indexes: [
+      { name: "ix_assignments_employee_id", fields: ["employee_id"] },
+      { name: "ix_assignments_subtask_id", fields: ["subtask_id"] },
+    ],
+  }
 );
 
 // Define EmployeeDetails Model
@@ -548,6 +556,104 @@ const db = mysql.createPool({
 
 export default db; // ✅ Use 'export default' instead of 'module.exports'
 
+// Long-lived Python workers (see worker.py). Each script is started with
+// --worker and then fed JSON-lines jobs, so requests no longer pay for a fresh
+// interpreter, imports and database engine. A worker handles one job at a time,
+// so every script gets a small pool of PYTHON_WORKERS of them; a job that takes
+// longer than PYTHON_JOB_TIMEOUT_MS is rejected and its worker restarted.
+const PYTHON_WORKERS = Math.max(1, parseInt(process.env.PYTHON_WORKERS || "2", 10));
+const PYTHON_JOB_TIMEOUT_MS = parseInt(process.env.PYTHON_JOB_TIMEOUT_MS || "120000", 10);
+
+function createPythonWorker(script) {
+  let child = null;
+  let buffer = "";
+  let nextJobId = 1;
+  const pending = new Map();
+
+  // Rejects everything still queued on proc and forgets it, once per process.
+  function fail(proc, err) {
+    if (child !== proc) return;
+    child = null;
+    buffer = "";
+    for (const job of pending.values()) {
+      clearTimeout(job.timer);
+      job.reject(err);
+    }
+    pending.clear();
+  }
+
+  function start() {
+    const proc = spawn("python", [script, "--worker"]);
+    child = proc;
+    proc.stdout.on("data", (data) => {
+      if (child !== proc) return;
+      buffer += data.toString();
+      let newline;
+      while ((newline = buffer.indexOf("\n")) !== -1) {
+        const line = buffer.slice(0, newline).trim();
+        buffer = buffer.slice(newline + 1);
+        if (!line) continue;
+        try {
+          const { id, result } = JSON.parse(line);
+          const job = pending.get(id);
+          if (job) {
+            pending.delete(id);
+            clearTimeout(job.timer);
+            job.resolve(result);
+          }
+        } catch (err) {
+          console.error(`${script} worker sent invalid JSON:`, line);
+        }
+      }
+    });
+    proc.stderr.on("data", (data) => {
+      console.error(`${script} worker error:`, data.toString());
+    });
+    proc.stdin.on("error", (err) => {
+      console.error(`${script} worker stdin:`, err.message);
+      fail(proc, new Error(`${script} worker stdin: ${err.message}`));
+    });
+    proc.on("error", (err) => {
+      console.error(`Failed to start ${script} worker:`, err);
+      fail(proc, err);
+    });
+    proc.on("close", (code) => {
+      console.error(`${script} worker exited with code ${code}`);
+      fail(proc, new Error(`${script} worker exited`));
+    });
+  }
+
+  const run = (payload) =>
+    new Promise((resolve, reject) => {
+      if (!child) start();
+      const proc = child;
+      const id = nextJobId++;
+      const timer = setTimeout(() => {
+        if (!pending.delete(id)) return;
+        reject(new Error(`${script} worker timed out after ${PYTHON_JOB_TIMEOUT_MS} ms`));
+        // The worker may be stuck on this job; restart it and fail what queued behind it.
+        fail(proc, new Error(`${script} worker restarted after a timeout`));
+        proc.kill();
+      }, PYTHON_JOB_TIMEOUT_MS);
+      pending.set(id, { resolve, reject, timer });
+      proc.stdin.write(JSON.stringify({ id, ...payload }) + "\n");
+    });
+
+  return { run, queued: () => pending.size };
+}
+
+// Sends each job to the least busy of `size` workers for script.
+function createPythonWorkerPool(script, size = PYTHON_WORKERS) {
+  const workers = Array.from({ length: size }, () => createPythonWorker(script));
+  return (payload) => {
+    const worker = workers.reduce((best, w) => (w.queued() < best.queued() ? w : best));
+    return worker.run(payload);
+  };
+}
+
+const runTaskGenerator = createPythonWorkerPool("task_generator.py");
+const runTaskAssigner = createPythonWorkerPool("task_assigner.py");
+
 app.get("/api/employees/unassigned", async (req, res) => {
   try {
     console.log("📢 Fetching unassigned employees...");
@@ -654,55 +760,33 @@ app.post("/generate-tasks", async (req, res) => {
     return res.status(500).json({ error: "Error checking existing tasks" });
   }
 
-  // Spawn the task generator Python script.
-  const generateTasksProcess = spawn("python", ["task_generator.py", project_id]);
-  let tasksOutput = "";
-  generateTasksProcess.stdout.on("data", (data) => {
-    tasksOutput += data.toString();
-  });
-  generateTasksProcess.stderr.on("data", (data) => {
-    console.error("Task Generator Python error:", data.toString());
-  });
-
-  generateTasksProcess.on("close", (code) => {
-    try {
-      const generateResult = JSON.parse(tasksOutput.trim());
-      if (generateResult.error) {
-        return res.status(500).json({ error: generateResult.error });
-      }
-      console.log("Task generation result:", generateResult);
-
-      // Now spawn the task assigner Python script.
-      const assignTasksProcess = spawn("python", ["task_assigner.py", project_id]);
-      let assignOutput = "";
-      assignTasksProcess.stdout.on("data", (data) => {
-        assignOutput += data.toString();
-        console.log("Task Assigner Python output:", data.toString());
-      });
-      assignTasksProcess.stderr.on("data", (data) => {
-        console.error("Task Assigner Python error:", data.toString());
-      });
+  // Run the task generator, then the task assigner, on the warm Python workers.
+  let generateResult;
+  try {
+    generateResult = await runTaskGenerator({ project_id });
+  } catch (err) {
+    console.error("Error running task generator:", err);
+    return res.status(500).json({ error: "Failed to process generated tasks" });
+  }
+  if (generateResult.error) {
+    return res.status(500).json({ error: generateResult.error });
+  }
+  console.log("Task generation result:", generateResult);
 
-      assignTasksProcess.on("close", (assignCode) => {
-        try {
-          const assignResult = JSON.parse(assignOutput.trim());
-          if (assignResult.error) {
-            return res.status(500).json({ error: assignResult.error });
-          }
-          return res.json({
-            message: "Tasks generated and assigned successfully",
-            assignments: assignResult.assignments,
-          });
-        } catch (err) {
-          console.error("Error parsing task assignment result:", err);
-          return res.status(500).json({ error: "Failed to process task assignment" });
-        }
-      });
-    } catch (err) {
-      console.error("Error parsing generated tasks result:", err);
-      return res.status(500).json({ error: "Failed to process generated tasks" });
+  try {
+    const assignResult = await runTaskAssigner({ project_id });
+    console.log("Task Assigner Python output:", assignResult);
+    if (assignResult.error) {
+      return res.status(500).json({ error: assignResult.error });
     }
-  });
+    return res.json({
+      message: "Tasks generated and assigned successfully",
+      assignments: assignResult.assignments,
+    });
+  } catch (err) {
+    console.error("Error running task assigner:", err);
+    return res.status(500).json({ error: "Failed to process task assignment" });
+  }
 });
 
 app.get('/api/project_details/:projectId', async (req, res) => {
@@ -1010,145 +1094,238 @@ setInterval(async () => {
   }
 }, 60000); // Runs every 60 seconds (1 minute)
 
-app.post("/api/log-milestone", async (req, res) => {
-  const { employee_id, milestone_id, message } = req.body;
-  if (!employee_id || !milestone_id || !message) {
-    return res.status(400).json({ error: "Employee ID, milestone ID, and message are required." });
-  }
-
-  try {
-    // 1. Log the milestone completion in assignmentlogs.
+// Completes one milestone the way the "Complete" button does: logs it, marks it
+// done and, once its subtask has all 5 milestones, closes the subtask and assigns
+// the employee a new one. Resolves to the HTTP status and JSON body to send.
+async function logMilestoneCompletion(employee_id, milestone_id, message) {
+  const reply = (status, body) => ({ status, body });
+  // 1. Log the milestone completion in assignmentlogs.
+  await db.query(
+    "INSERT INTO assignmentlogs (employee_id, log_message, createdAt, updatedAt) VALUES (?, ?, NOW(), NOW())",
+    [employee_id, message]
+  );
+
+  // 2. Retrieve the subtask_id for the given milestone.
+  const [subtaskRows] = await db.query(
+    "SELECT subtask_id FROM milestones WHERE id = ?",
+    [milestone_id]
+  );
+  if (subtaskRows.length === 0) {
+    return reply(404, { error: "Milestone not found." });
+  }
+  const subtask_id = subtaskRows[0].subtask_id;
+
+  // 3. Immediately update the milestone's status to 1.
+  await db.query("UPDATE milestones SET status = 1 WHERE id = ?", [milestone_id]);
+
+  // 4. Count how many milestones in this subtask have status = 1.
+  const [completedMilestones] = await db.query(
+    "SELECT COUNT(*) AS completed_count FROM milestones WHERE subtask_id = ? AND status = 1",
+    [subtask_id]
+  );
+  const completedCount = completedMilestones[0].completed_count;
+  console.log(`Employee ${employee_id} - subtask ${subtask_id}: ${completedCount} milestones completed.`);
+
+  // 5. If all 5 milestones are completed, update statuses and assign a new subtask.
+  if (completedCount >= 5) {
+    console.log(`Subtask ${subtask_id} completed! Updating statuses.`);
+    
+    // Mark the assignment for this subtask as complete.
+    await db.query(
+      "UPDATE assignments SET status = 1 WHERE subtask_id = ? AND employee_id = ?",
+      [subtask_id, employee_id]
+    );
+    // Mark the subtask itself as complete.
     await db.query(
-      "INSERT INTO assignmentlogs (employee_id, log_message, createdAt, updatedAt) VALUES (?, ?, NOW(), NOW())",
-      [employee_id, message]
+      "UPDATE subtasks SET status = 1 WHERE id = ?",
+      [subtask_id]
     );
 
-    // 2. Retrieve the subtask_id for the given milestone.
-    const [subtaskRows] = await db.query(
-      "SELECT subtask_id FROM milestones WHERE id = ?",
-      [milestone_id]
+    // 5.a Retrieve the project ID from the subtask's parent task.
+    const [subtaskInfo] = await db.query(
+      "SELECT task_id FROM subtasks WHERE id = ?",
+      [subtask_id]
     );
-    if (subtaskRows.length === 0) {
-      return res.status(404).json({ error: "Milestone not found." });
+    if (!subtaskInfo.length) {
+      return reply(404, { error: "Subtask information not found." });
     }
-    const subtask_id = subtaskRows[0].subtask_id;
-
-    // 3. Immediately update the milestone's status to 1.
-    await db.query("UPDATE milestones SET status = 1 WHERE id = ?", [milestone_id]);
+    const task_id = subtaskInfo[0].task_id;
+    const [taskInfo] = await db.query(
+      "SELECT project_id FROM tasks WHERE id = ?",
+      [task_id]
+    );
+    if (!taskInfo.length) {
+      return reply(404, { error: "Task information not found." });
+    }
+    const project_id = taskInfo[0].project_id;
 
-    // 4. Count how many milestones in this subtask have status = 1.
-    const [completedMilestones] = await db.query(
-      "SELECT COUNT(*) AS completed_count FROM milestones WHERE subtask_id = ? AND status = 1",
-      [subtask_id]
+    // 5.b Retrieve the employee's skills and domains.
+    const [employeeRows] = await db.query(
+      "SELECT skills, domains FROM employee_details WHERE employee_id = ?",
+      [employee_id]
     );
-    const completedCount = completedMilestones[0].completed_count;
-    console.log(`Employee ${employee_id} - subtask ${subtask_id}: ${completedCount} milestones completed.`);
+    let criteria = [];
+    if (employeeRows.length > 0) {
+      if (employeeRows[0].skills) {
+        criteria = criteria.concat(employeeRows[0].skills.split(",").map(s => s.trim().toLowerCase()));
+      }
+      if (employeeRows[0].domains) {
+        criteria = criteria.concat(employeeRows[0].domains.split(",").map(d => d.trim().toLowerCase()));
+      }
+    }
 
-    // 5. If all 5 milestones are completed, update statuses and assign a new subtask.
-    if (completedCount >= 5) {
-      console.log(`Subtask ${subtask_id} completed! Updating statuses.`);
-      
-      // Mark the assignment for this subtask as complete.
-      await db.query(
-        "UPDATE assignments SET status = 1 WHERE subtask_id = ? AND employee_id = ?",
-        [subtask_id, employee_id]
-      );
-      // Mark the subtask itself as complete.
-      await db.query(
-        "UPDATE subtasks SET status = 1 WHERE id = ?",
-        [subtask_id]
-      );
+    // 5.c Retrieve available subtasks from the same project that are not actively assigned (status = 0).
+    const [availableSubtasks] = await db.query(
+      `
+      SELECT st.id AS subtask_id, st.name AS subtask_name, t.project_id
+      FROM subtasks st
+      JOIN tasks t ON st.task_id = t.id
+      WHERE t.project_id = ? 
+        AND st.status = 0
+        AND st.id NOT IN (
+          SELECT subtask_id FROM assignments WHERE status = 0
+        )
+      `,
+      [project_id]
+    );
 
-      // 5.a Retrieve the project ID from the subtask's parent task.
-      const [subtaskInfo] = await db.query(
-        "SELECT task_id FROM subtasks WHERE id = ?",
-        [subtask_id]
-      );
-      if (!subtaskInfo.length) {
-        return res.status(404).json({ error: "Subtask information not found." });
-      }
-      const task_id = subtaskInfo[0].task_id;
-      const [taskInfo] = await db.query(
-        "SELECT project_id FROM tasks WHERE id = ?",
-        [task_id]
-      );
-      if (!taskInfo.length) {
-        return res.status(404).json({ error: "Task information not found." });
+    // 5.d Calculate a match score for each available subtask based on combined criteria.
+    function matchScore(subtaskName) {
+      let score = 0;
+      const keywords = subtaskName.toLowerCase().split(" ");
+      for (const crit of criteria) {
+        if (keywords.includes(crit)) score++;
       }
-      const project_id = taskInfo[0].project_id;
+      return score;
+    }
 
-      // 5.b Retrieve the employee's skills and domains.
-      const [employeeRows] = await db.query(
-        "SELECT skills, domains FROM employee_details WHERE employee_id = ?",
-        [employee_id]
-      );
-      let criteria = [];
-      if (employeeRows.length > 0) {
-        if (employeeRows[0].skills) {
-          criteria = criteria.concat(employeeRows[0].skills.split(",").map(s => s.trim().toLowerCase()));
-        }
-        if (employeeRows[0].domains) {
-          criteria = criteria.concat(employeeRows[0].domains.split(",").map(d => d.trim().toLowerCase()));
-        }
+    let bestSubtask = null;
+    let bestScore = 0;
+    for (const subtask of availableSubtasks) {
+      const score = matchScore(subtask.subtask_name);
+      if (score > bestScore) {
+        bestScore = score;
+        bestSubtask = subtask;
       }
+    }
+    // Fallback: if no best match found, assign the first available subtask.
+    if (!bestSubtask && availableSubtasks.length > 0) {
+      bestSubtask = availableSubtasks[0];
+    }
 
-      // 5.c Retrieve available subtasks from the same project that are not actively assigned (status = 0).
-      const [availableSubtasks] = await db.query(
-        `
-        SELECT st.id AS subtask_id, st.name AS subtask_name, t.project_id
-        FROM subtasks st
-        JOIN tasks t ON st.task_id = t.id
-        WHERE t.project_id = ? 
-          AND st.status = 0
-          AND st.id NOT IN (
-            SELECT subtask_id FROM assignments WHERE status = 0
-          )
-        `,
-        [project_id]
+    if (bestSubtask) {
+      // Insert new assignment for the selected subtask, including timestamps.
+      await db.query(
+        "INSERT INTO assignments (employee_id, subtask_id, status, createdAt, updatedAt) VALUES (?, ?, 0, NOW(), NOW())",
+        [employee_id, bestSubtask.subtask_id]
       );
+      console.log(`Assigned new subtask ${bestSubtask.subtask_id} to employee ${employee_id}`);
+      return reply(200, { message: "Subtask completed, new subtask assigned.", subtask: bestSubtask });
+    } else {
+      return reply(200, { message: "Subtask completed. No new subtask available based on skills and domains." });
+    }
+  }
 
-      // 5.d Calculate a match score for each available subtask based on combined criteria.
-      function matchScore(subtaskName) {
-        let score = 0;
-        const keywords = subtaskName.toLowerCase().split(" ");
-        for (const crit of criteria) {
-          if (keywords.includes(crit)) score++;
-        }
-        return score;
-      }
+  // 6. If not all milestones are complete, simply return success.
+  return reply(200, { success: true, message: "Milestone logged successfully." });
+}
 
-      let bestSubtask = null;
-      let bestScore = 0;
-      for (const subtask of availableSubtasks) {
-        const score = matchScore(subtask.subtask_name);
-        if (score > bestScore) {
-          bestScore = score;
-          bestSubtask = subtask;
-        }
+app.post("/api/log-milestone", async (req, res) => {
+  const { employee_id, milestone_id, message } = req.body;
+  if (!employee_id || !milestone_id || !message) {
+    return res.status(400).json({ error: "Employee ID, milestone ID, and message are required." });
+  }
+
+  try {
+    const { status, body } = await logMilestoneCompletion(employee_id, milestone_id, message);
+    res.status(status).json(body);
+  } catch (err) {
+    console.error("Error logging milestone:", err);
+    res.status(500).json({ error: "Database query failed." });
+  }
+});
+
+// Batch variant used by ai_agent.py: completes every given milestone for one
+// employee in a single request instead of driving the UI once per milestone.
+// milestone_ids are matched exactly against the employee's open milestones;
+// milestone_names (agent runs without ids) are matched like the browser mode
+// did: the first unused open milestone whose name contains the given text
+// (case-insensitive).
+app.post("/api/log-milestones/batch", async (req, res) => {
+  const { employee_email, milestone_ids = [], milestone_names = [], message = "Completed milestone" } = req.body;
+  if (!employee_email || !Array.isArray(milestone_ids) || !Array.isArray(milestone_names)) {
+    return res.status(400).json({ error: "employee_email and milestone_ids and/or milestone_names arrays are required." });
+  }
+
+  try {
+    const employee = await EmployeeDetails.findOne({ where: { email: employee_email } });
+    if (!employee) {
+      return res.status(404).json({ error: "Employee not found" });
+    }
+    const employee_id = employee.employee_id;
+
+    const wantedIds = [...new Set(milestone_ids.map(Number))];
+    if (!wantedIds.every(Number.isInteger)) {
+      return res.status(400).json({ error: "milestone_ids must be integers." });
+    }
+    let byId = [];
+    if (wantedIds.length > 0) {
+      [byId] = await db.query(`
+        SELECT DISTINCT m.id AS milestone_id, m.name AS milestone_name
+        FROM milestones m
+        JOIN subtasks st ON m.subtask_id = st.id
+        JOIN assignments a ON st.id = a.subtask_id
+        WHERE m.id IN (?) AND a.employee_id = ? AND m.status = 0
+        ORDER BY m.id
+      `, [wantedIds, employee_id]);
+    }
+    let openMilestones = [];
+    if (milestone_names.length > 0) {
+      [openMilestones] = await db.query(`
+        SELECT m.id AS milestone_id, m.name AS milestone_name
+        FROM milestones m
+        JOIN subtasks st ON m.subtask_id = st.id
+        JOIN assignments a ON st.id = a.subtask_id
+        WHERE a.employee_id = ? AND m.status = 0
+        ORDER BY m.id
+      `, [employee_id]);
+    }
+
+    const matches = [];
+    const notFound = [];
+    const used = new Set();
+    for (const id of wantedIds) {
+      const match = byId.find((m) => m.milestone_id === id);
+      if (!match) {
+        notFound.push(id);
+        continue;
       }
-      // Fallback: if no best match found, assign the first available subtask.
-      if (!bestSubtask && availableSubtasks.length > 0) {
-        bestSubtask = availableSubtasks[0];
+      used.add(match.milestone_id);
+      matches.push({ name: match.milestone_name, milestone_id: match.milestone_id });
+    }
+    for (const name of milestone_names) {
+      const wanted = String(name).toLowerCase();
+      const match = openMilestones.find(
+        (m) => !used.has(m.milestone_id) && m.milestone_name.toLowerCase().includes(wanted)
+      );
+      if (!match) {
+        notFound.push(name);
+        continue;
       }
+      used.add(match.milestone_id);
+      matches.push({ name, milestone_id: match.milestone_id });
+    }
 
-      if (bestSubtask) {
-        // Insert new assignment for the selected subtask, including timestamps.
-        await db.query(
-          "INSERT INTO assignments (employee_id, subtask_id, status, createdAt, updatedAt) VALUES (?, ?, 0, NOW(), NOW())",
-          [employee_id, bestSubtask.subtask_id]
-        );
-        console.log(`Assigned new subtask ${bestSubtask.subtask_id} to employee ${employee_id}`);
-        return res.json({ message: "Subtask completed, new subtask assigned.", subtask: bestSubtask });
-      } else {
-        return res.json({ message: "Subtask completed. No new subtask available based on skills and domains." });
-      }
+    const completed = [];
+    // Sequential on purpose: each completion can close a subtask and change assignments.
+    for (const { name, milestone_id } of matches) {
+      const { status, body } = await logMilestoneCompletion(employee_id, milestone_id, message);
+      completed.push({ name, milestone_id, status, result: body });
     }
 
-    // 6. If not all milestones are complete, simply return success.
-    res.json({ success: true, message: "Milestone logged successfully." });
-    
+    res.json({ completed, not_found: notFound });
   } catch (err) {
-    console.error("Error logging milestone:", err);
+    console.error("Error logging milestone batch:", err);
     res.status(500).json({ error: "Database query failed." });
   }
 });
@@ -1735,6 +1912,20 @@ app.post("/api/predict", async (req, res) => {
   }
 });
 
+// Scores many feature rows with one model call: { rows: [features, ...] }.
+app.post("/api/predict/batch", async (req, res) => {
+  try {
+    const response = await axios.post("http://localhost:5001/api/predict/batch", req.body, {
+      headers: { "Content-Type": "application/json" },
+    });
+    res.status(200).json(response.data);
+  } catch (error) {
+    console.error("Error getting batch predictions:", error.message);
+    const status = error.response ? error.response.status : 500;
+    res.status(status).json(error.response ? error.response.data : { error: "Failed to get predictions" });
+  }
+});
+
 app.get("/api/generate-tasks-preview", async (req, res) => {
   try {
     const { project_id, feedback } = req.query;
@@ -1897,30 +2088,21 @@ app.post("/api/confirm-tasks", async (req, res) => {
       }
     }
     
-    // Now call task_assigner.py to assign the tasks.
-    const assignTasks = spawn("python", ["task_assigner.py", project_id]);
-
-    let assignOutput = "";
-    assignTasks.stdout.on("data", (data) => {
-      assignOutput += data.toString();
-      console.log("Python Output (Assignment):", data.toString());
-    });
-    assignTasks.stderr.on("data", (data) => {
-      console.error("Python Error (Assignment):", data.toString());
-    });
-    assignTasks.on("close", async (assignCode) => {
-      try {
-        const assignResponse = JSON.parse(assignOutput.trim());
-        if (assignResponse.error) {
-          return res.status(500).json({ error: assignResponse.error });
-        }
-        return res.json({
-          message: "Tasks confirmed and assigned successfully",
-          assignments: assignResponse.assignments,
-        });
-      } catch (error) {
-        return res.status(500).json({ error: "Failed to process task assignment" });
-      }
+    // Now run the task assigner on its warm Python worker.
+    let assignResponse;
+    try {
+      assignResponse = await runTaskAssigner({ project_id });
+      console.log("Python Output (Assignment):", assignResponse);
+    } catch (error) {
+      console.error("Python Error (Assignment):", error);
+      return res.status(500).json({ error: "Failed to process task assignment" });
+    }
+    if (assignResponse.error) {
+      return res.status(500).json({ error: assignResponse.error });
+    }
+    return res.json({
+      message: "Tasks confirmed and assigned successfully",
+      assignments: assignResponse.assignments,
     });
   } catch (error) {
     console.error("Error in /api/confirm-tasks:", error);
@@ -1956,6 +2138,47 @@ app.get("/api/employee-milestones", async (req, res) => {
 });
 
 import fs from "fs";
+import os from "os";
+import { randomUUID } from "crypto";
+
+// Runs `ai_agent.py --batch` on {employees: [...]} and calls back with (exit code,
+// stdout). The payload goes over the child's stdin, so concurrent checks never
+// share a file and the agent never scans a directory. With AI_AGENT_HANDOFF=file
+// it is written to a spool file unique to this call instead, which is removed
+// once the agent exits.
+function runAiAgent(payload, extraArgs, callback) {
+  const body = JSON.stringify(payload);
+  let spoolPath = null;
+  if (process.env.AI_AGENT_HANDOFF === "file") {
+    spoolPath = path.join(os.tmpdir(), `ai_agent_${randomUUID()}.json`);
+    fs.writeFileSync(spoolPath, body, { encoding: "utf-8" });
+  }
+  const child = spawn("python", ["ai_agent.py", "--batch", spoolPath || "-", ...extraArgs]);
+
+  let output = "";
+  let finished = false;
+  const finish = (code) => {
+    if (finished) return;
+    finished = true;
+    if (spoolPath) fs.rm(spoolPath, { force: true }, () => {});
+    callback(code, output);
+  };
+  child.stdout.on("data", (data) => {
+    output += data.toString();
+  });
+  child.stderr.on("data", (data) => {
+    console.error("AI Agent stderr:", data.toString());
+  });
+  child.on("error", (err) => {
+    console.error("Failed to start AI Agent:", err);
+    finish(-1);
+  });
+  child.on("close", finish);
+  if (!spoolPath) {
+    child.stdin.on("error", (err) => console.error("AI Agent stdin:", err.message));
+    child.stdin.end(body);
+  }
+}
 
 app.post("/api/ai-check-all-new", async (req, res) => {
   try {
@@ -1992,8 +2215,8 @@ app.post("/api/ai-check-all-new", async (req, res) => {
       return res.status(404).json({ error: "No tasks/milestones found for this employee." });
     }
 
-    // Build aggregated text and collect task names
-    let aggregatedText = "";
+    // Collect milestone names and task names
+    const openMilestones = [];
     const tasksSet = new Set(); // To compute the domain from task names
 
     assignments.forEach((assignment) => {
@@ -2007,41 +2230,25 @@ app.post("/api/ai-check-all-new", async (req, res) => {
 
       // Use the alias "Milestones" if it is defined in your association (adjust if needed)
       const milestones = subtask.Milestones || [];
-      if (milestones.length === 0) {
-        aggregatedText += `Task: ${task ? task.name : "Unknown"} - Milestone: None\n`;
-      } else {
-        milestones.forEach((milestone) => {
-          aggregatedText += `Task: ${task ? task.name : "Unknown"} - Milestone: ${milestone.name}\n`;
-        });
-      }
+      milestones.forEach((milestone) => {
+        // Milestones already done in the DB are not worth asking the AI about.
+        if (milestone.status === 0) {
+          openMilestones.push({ id: milestone.id, name: milestone.name });
+        }
+      });
     });
 
-    if (!aggregatedText.trim()) {
+    if (openMilestones.length === 0) {
       return res.status(404).json({ error: "No milestones available to check for this employee." });
     }
 
     // Use the unique task names as the domain (or task name). If multiple tasks exist, they are joined with a comma.
     const domain = [...tasksSet].join(", ");
 
-    // Define a temporary file path for the aggregated text
-    const tempFilePath = path.join(__dirname, "temp_aggregated.txt");
-
-    // Write the aggregated text to the file
-    fs.writeFileSync(tempFilePath, aggregatedText, { encoding: "utf-8" });
-    console.log("Aggregated milestones written to:", tempFilePath);
-
-    // Spawn the ai_agent.py process with both arguments (aggregated file and domain/task name)
-    console.log(`Spawning AI Agent with arguments: [${tempFilePath}, ${domain}]`);
-    const child = spawn("python", ["ai_agent.py", tempFilePath, domain, employee_email]);
-
-    let output = "";
-    child.stdout.on("data", (data) => {
-      output += data.toString();
-    });
-    child.stderr.on("data", (data) => {
-      console.error("AI Agent stderr:", data.toString());
-    });
-    child.on("close", (code) => {
+    // Hand this request's milestones straight to the agent (see runAiAgent).
+    console.log(`Spawning AI Agent for ${employee_email} with ${openMilestones.length} milestones [${domain}]`);
+    const employees = [{ employee_email, domain, milestones: openMilestones }];
+    runAiAgent({ employees }, [], (code, output) => {
       console.log("AI Agent process exited with code", code);
       return res.json({ message: "AI check completed", output });
     });
@@ -2051,6 +2258,58 @@ app.post("/api/ai-check-all-new", async (req, res) => {
   }
 });
 
+// Checks every employee on a project in one ai_agent.py run. The agent dedupes
+// milestone texts across employees, packs them into as few LLM requests as fit
+// and completes each employee's finished milestones.
+app.post("/api/ai-check-project", async (req, res) => {
+  const { project_id, mode } = req.body;
+  if (!project_id) {
+    return res.status(400).json({ error: "project_id is required." });
+  }
+
+  try {
+    const [rows] = await db.query(`
+      SELECT e.email, t.name AS task_name, m.id AS milestone_id, m.name AS milestone_name
+      FROM assignments a
+      JOIN employee_details e ON e.employee_id = a.employee_id
+      JOIN subtasks st ON st.id = a.subtask_id
+      JOIN tasks t ON t.id = st.task_id
+      JOIN milestones m ON m.subtask_id = st.id
+      WHERE t.project_id = ? AND m.status = 0
+      ORDER BY e.email, m.id
+    `, [project_id]);
+
+    if (rows.length === 0) {
+      return res.status(404).json({ error: "No open milestones found for this project." });
+    }
+
+    const byEmployee = new Map();
+    for (const row of rows) {
+      if (!byEmployee.has(row.email)) {
+        byEmployee.set(row.email, { tasks: new Set(), milestones: [] });
+      }
+      const entry = byEmployee.get(row.email);
+      entry.tasks.add(row.task_name);
+      entry.milestones.push({ id: row.milestone_id, name: row.milestone_name });
+    }
+    // Same domain the per-employee check uses: the employee's task names.
+    const employees = [...byEmployee].map(([email, entry]) => ({
+      employee_email: email,
+      domain: [...entry.tasks].join(", "),
+      milestones: entry.milestones,
+    }));
+
+    const extraArgs = mode === "api" || mode === "browser" ? ["--mode", mode] : [];
+    runAiAgent({ employees }, extraArgs, (code, output) => {
+      console.log("AI Agent batch process exited with code", code);
+      return res.json({ message: "AI check completed", employees: employees.length, output });
+    });
+  } catch (error) {
+    console.error("Error in /api/ai-check-project:", error);
+    return res.status(500).json({ error: "Failed to run AI Agent" });
+  }
+});
+
 app.post("/api/save-badge-config", async (req, res) => {
   const badgeConfigs = req.body.badgeConfigs;
   const values = Object.entries(badgeConfigs).map(([id, cfg]) => [
@@ -2107,7 +2366,10 @@ app.post('/api/generate-doc', (req, res) => {
   // Path to your documentation generation script
   const scriptPath = path.join(__dirname, 'documentation_agent.py');
 
-  exec(`python "${scriptPath}"`, (error, stdout, stderr) => {
+  // Only changed files are re-documented unless the client asks for a full rebuild.
+  const fullFlag = req.body && req.body.full ? ' --full' : '';
+
+  exec(`python "${scriptPath}"${fullFlag}`, (error, stdout, stderr) => {
     if (error) {
       console.error(`Error running documentation agent: ${stderr}`);
       return res.status(500).send("Error generating documentation");
@@ -0,0 +1,195 @@
+import numpy as np
+
+# scipy.sparse and scipy.optimize are imported where they are used: together
+# they take longer to import than the rest of task_assigner's CLI path.
+
+# greedy: the original first-come pass; hungarian: one subtask per employee,
+# maximising the total score; flow: each employee may take up to `capacity`
+# subtasks, solved as a Hungarian assignment over `capacity` copies of every
+# employee column (not a min-cost-flow solver).
+SOLVERS = ("greedy", "hungarian", "flow")
+# Largest capacity the API and worker accept; the score matrix grows with it.
+MAX_CAPACITY = 100
+
+# Use the dense scoring path while the token x employee matrix stays under this
+# many cells (~100 MB as float32).
+DENSE_EMPLOYEE_CELLS = 25_000_000
+# Cells per dense score block and rows per sparse score block.
+BLOCK_CELLS = 4_000_000
+SPARSE_BLOCK_ROWS = 2048
+
+
+def employee_token_sets(employee):
+    """Skill and domain tokens exactly as match_employee_to_subtask splits them."""
+    skills = set(employee.skills.lower().split(',')) if employee.skills else set()
+    domains = set(employee.domains.lower().split(',')) if employee.domains else set()
+    return skills, domains
+
+
+def subtask_keywords(subtask):
+    return set(subtask.name.lower().split())
+
+
+class SkillMatcher:
+    """
+    Scores many subtasks against many employees with matrix products.
+
+    Each employee is tokenized once. score_matrix() builds a subtask x token
+    matrix of keyword hits and a token x employee matrix holding, per token, 1 for
+    a skill hit plus 1 for a domain hit, so their product is exactly
+    match_employee_to_subtask() for every (subtask, employee) pair.
+    """
+
+    def __init__(self, employees):
+        self.employees = list(employees)
+        self._weights = []
+        for employee in self.employees:
+            skills, domains = employee_token_sets(employee)
+            weights = {}
+            for token in skills:
+                weights[token] = weights.get(token, 0) + 1
+            for token in domains:
+                weights[token] = weights.get(token, 0) + 1
+            self._weights.append(weights)
+
+    def _subtask_matrix(self, subtasks):
+        from scipy import sparse
+
+        vocab = {}
+        rows, cols = [], []
+        for i, subtask in enumerate(subtasks):
+            for token in subtask_keywords(subtask):
+                rows.append(i)
+                cols.append(vocab.setdefault(token, len(vocab)))
+        data = np.ones(len(rows), dtype=np.int32)
+        matrix = sparse.csr_matrix((data, (rows, cols)), shape=(len(subtasks), len(vocab)))
+        return matrix, vocab
+
+    def _employee_matrix(self, vocab):
+        from scipy import sparse
+
+        rows, cols, data = [], [], []
+        for j, weights in enumerate(self._weights):
+            for token, weight in weights.items():
+                k = vocab.get(token)
+                if k is not None:
+                    rows.append(k)
+                    cols.append(j)
+                    data.append(weight)
+        return sparse.csr_matrix(
+            (np.array(data, dtype=np.int32), (rows, cols)),
+            shape=(len(vocab), len(self.employees)),
+        )
+
+    def score_matrix(self, subtasks):
+        """Sparse (len(subtasks) x len(employees)) matrix of match scores."""
+        subtask_matrix, vocab = self._subtask_matrix(subtasks)
+        return (subtask_matrix @ self._employee_matrix(vocab)).tocsr()
+
+    def assign_greedy(self, subtasks):
+        """
+        Reproduces the original greedy loop: subtasks in order, each takes the
+        highest-scoring free employee (earliest employee on ties), subtasks with no
+        positive score are skipped, and assignment stops once every employee is taken.
+        Scores are produced a block of subtasks at a time to bound memory.
+        Returns (subtask, employee) pairs.
+        """
+        subtasks = list(subtasks)
+        if not self.employees or not subtasks:
+            return []
+        subtask_matrix, vocab = self._subtask_matrix(subtasks)
+        employee_matrix = self._employee_matrix(vocab)
+        # A small vocabulary means nearly every pair shares a token, so the score
+        # matrix is effectively dense and a BLAS product beats a sparse one.
+        if len(vocab) * len(self.employees) <= DENSE_EMPLOYEE_CELLS:
+            picks = self._greedy_dense(subtask_matrix, employee_matrix)
+        else:
+            picks = self._greedy_sparse(subtask_matrix, employee_matrix)
+        return [(subtasks[i], self.employees[j]) for i, j in picks]
+
+    def _greedy_dense(self, subtask_matrix, employee_matrix):
+        n_employees = len(self.employees)
+        dense_employees = employee_matrix.toarray().astype(np.float32)
+        taken = np.zeros(n_employees, dtype=bool)
+        block_size = max(1, BLOCK_CELLS // n_employees)
+        picks = []
+        for block_start in range(0, subtask_matrix.shape[0], block_size):
+            block = subtask_matrix[block_start:block_start + block_size].toarray().astype(np.float32)
+            scores = block @ dense_employees
+            scores[:, taken] = -1
+            for offset in range(scores.shape[0]):
+                row = scores[offset]
+                best = int(row.argmax())  # first maximum, i.e. earliest employee on ties
+                if row[best] <= 0:
+                    continue
+                taken[best] = True
+                scores[:, best] = -1
+                picks.append((block_start + offset, best))
+                if len(picks) == n_employees:
+                    return picks
+        return picks
+
+    def _greedy_sparse(self, subtask_matrix, employee_matrix):
+        n_employees = len(self.employees)
+        taken = np.zeros(n_employees, dtype=bool)
+        picks = []
+        for block_start in range(0, subtask_matrix.shape[0], SPARSE_BLOCK_ROWS):
+            scores = (subtask_matrix[block_start:block_start + SPARSE_BLOCK_ROWS] @ employee_matrix).tocsr()
+            for offset in range(scores.shape[0]):
+                start, end = scores.indptr[offset], scores.indptr[offset + 1]
+                if start == end:
+                    continue
+                cols = scores.indices[start:end]
+                vals = scores.data[start:end]
+                free = ~taken[cols]
+                cols, vals = cols[free], vals[free]
+                if cols.size == 0:
+                    continue
+                best_score = vals.max()
+                if best_score <= 0:
+                    continue
+                best = int(cols[vals == best_score].min())
+                taken[best] = True
+                picks.append((block_start + offset, best))
+                if len(picks) == n_employees:
+                    return picks
+        return picks
+
+    def assign_optimal(self, subtasks, capacity=1):
+        """
+        Globally optimal assignment maximising the summed match score.
+
+        With capacity=1 this is a plain linear_sum_assignment (Hungarian) over the
+        score matrix. With capacity=k every employee column is repeated k times and
+        the widened matrix goes through the same Hungarian solve, so one employee
+        can take up to k subtasks. The dense matrix is subtasks x (employees * k),
+        so k is clamped to the number of subtasks (more copies can never be used).
+        Zero-score pairs are dropped, as in the greedy pass.
+        Returns (subtask, employee) pairs in subtask order.
+        """
+        from scipy.optimize import linear_sum_assignment
+
+        subtasks = list(subtasks)
+        if not self.employees or not subtasks:
+            return []
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        capacity = min(capacity, len(subtasks))
+        scores = self.score_matrix(subtasks).toarray()
+        if capacity > 1:
+            scores = np.repeat(scores, capacity, axis=1)
+        rows, cols = linear_sum_assignment(scores, maximize=True)
+        return [
+            (subtasks[i], self.employees[j // capacity])
+            for i, j in sorted(zip(rows, cols))
+            if scores[i, j] > 0
+        ]
+
+    def assign(self, subtasks, solver="greedy", capacity=1):
+        if solver == "greedy":
+            return self.assign_greedy(subtasks)
+        if solver == "hungarian":
+            return self.assign_optimal(subtasks)
+        if solver == "flow":
+            return self.assign_optimal(subtasks, capacity=capacity)
+        raise ValueError(f"Unknown solver '{solver}'. Expected one of: {', '.join(SOLVERS)}")
@@ -0,0 +1,117 @@
+from sqlalchemy import select, func
+
+# Rows per multi-row INSERT. Kept low enough that the bound parameter count
+# stays under SQLite's 999-variable limit, which the benchmarks run against.
+DEFAULT_BATCH_SIZE = 250
+
+DEFAULT_MILESTONE_NAMES = [f"Default Milestone {i}" for i in range(1, 6)]
+
+
+def _batches(rows, size):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def flatten_task_tree(tasks_preview):
+    """
+    Normalises a generated preview into a list of (task_name, [(subtask_name, [milestone_names])]).
+    Applies the same defaults the per-row insert loop always used: a task without
+    subtasks gets one "Default Subtask", and a subtask without exactly 5 milestones
+    gets the 5 default milestones.
+    """
+    tree = []
+    for category in tasks_preview.get("tasks", []):
+        for task_data in category.get("tasks", []):
+            task_name = task_data.get("task", "Unnamed Task")
+            subtasks = task_data.get("subtasks")
+            if not subtasks:
+                tree.append((task_name, [("Default Subtask", list(DEFAULT_MILESTONE_NAMES))]))
+                continue
+
+            flat_subtasks = []
+            for subtask_data in subtasks:
+                subtask_name = subtask_data.get("name", "Unnamed Subtask")
+                milestones = subtask_data.get("milestones")
+                if not milestones or len(milestones) != 5:
+                    milestone_names = list(DEFAULT_MILESTONE_NAMES)
+                else:
+                    milestone_names = [m.get("name", "Unnamed Milestone") for m in milestones]
+                flat_subtasks.append((subtask_name, milestone_names))
+            tree.append((task_name, flat_subtasks))
+    return tree
+
+
+def persist_task_tree(session, task_model, subtask_model, milestone_model,
+                      tasks_preview, project_id, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Writes a whole Task/Subtask/Milestone tree in one transaction.
+
+    Each level goes out as multi-row INSERTs, and the generated ids are read back
+    with one SELECT per batch instead of one flush per row. The caller owns the
+    session and is expected to roll back if this raises.
+    Returns the number of rows written per table.
+    """
+    tasks = task_model.__table__
+    subtasks = subtask_model.__table__
+    milestones = milestone_model.__table__
+
+    tree = flatten_task_tree(tasks_preview)
+    if not tree:
+        session.commit()
+        return {"tasks": 0, "subtasks": 0, "milestones": 0}
+
+    # 1. Tasks. Auto-increment ids grow monotonically in insert order, so every
+    #    task of this project above the current max id is one of ours.
+    id_floor = session.execute(select(func.max(tasks.c.id))).scalar() or 0
+    task_rows = [{"name": name, "project_id": project_id, "status": 0} for name, _ in tree]
+    for batch in _batches(task_rows, batch_size):
+        session.execute(tasks.insert().values(batch))
+    task_ids = session.execute(
+        select(tasks.c.id)
+        .where(tasks.c.project_id == project_id, tasks.c.id > id_floor)
+        .order_by(tasks.c.id)
+    ).scalars().all()
+    if len(task_ids) != len(task_rows):
+        raise RuntimeError(
+            f"Expected {len(task_rows)} new tasks for project {project_id}, found {len(task_ids)}"
+        )
+
+    # 2. Subtasks. The parent task ids were created above, so reading back by
+    #    task_id returns exactly the rows we inserted, in insert order.
+    subtask_rows = []
+    milestone_names_per_subtask = []
+    for task_id, (_, flat_subtasks) in zip(task_ids, tree):
+        for subtask_name, milestone_names in flat_subtasks:
+            subtask_rows.append({"name": subtask_name, "task_id": task_id})
+            milestone_names_per_subtask.append(milestone_names)
+    for batch in _batches(subtask_rows, batch_size):
+        session.execute(subtasks.insert().values(batch))
+
+    subtask_ids = []
+    for task_id_batch in _batches(task_ids, batch_size):
+        rows = session.execute(
+            select(subtasks.c.id, subtasks.c.task_id)
+            .where(subtasks.c.task_id.in_(task_id_batch))
+            .order_by(subtasks.c.id)
+        ).all()
+        subtask_ids.extend(row.id for row in rows)
+    if len(subtask_ids) != len(subtask_rows):
+        raise RuntimeError(
+            f"Expected {len(subtask_rows)} new subtasks for project {project_id}, found {len(subtask_ids)}"
+        )
+
+    # 3. Milestones. Nothing references them, so no ids need resolving.
+    milestone_rows = [
+        {"name": name, "subtask_id": subtask_id, "status": 0}
+        for subtask_id, names in zip(subtask_ids, milestone_names_per_subtask)
+        for name in names
+    ]
+    for batch in _batches(milestone_rows, batch_size):
+        session.execute(milestones.insert().values(batch))
+
+    session.commit()
+    return {
+        "tasks": len(task_rows),
+        "subtasks": len(subtask_rows),
+        "milestones": len(milestone_rows),
+    }
@@ -0,0 +1,82 @@
+"""
+Long-lived worker mode shared by task_generator.py and task_assigner.py.
+
+Jobs arrive as JSON lines, either on stdin or on a local Unix socket:
+
+    {"id": 7, "project_id": 12}
+
+and each one is answered with a single line carrying the same JSON the script
+prints in one-shot mode:
+
+    {"id": 7, "result": {"message": "...", ...}}
+
+A {"op": "ping"} job answers {"pong": true} without touching the database.
+Jobs are handled one at a time, so the module-level session is never shared
+between concurrent jobs.
+"""
+import argparse
+import json
+import os
+import socketserver
+import sys
+
+
+def handle_line(line, handle_job):
+    try:
+        job = json.loads(line)
+    except json.JSONDecodeError as e:
+        return {"id": None, "result": {"error": f"Invalid job: {e}"}}
+    if not isinstance(job, dict):
+        return {"id": None, "result": {"error": "Invalid job: expected a JSON object"}}
+
+    job_id = job.get("id")
+    if job.get("op") == "ping":
+        return {"id": job_id, "result": {"pong": True}}
+    try:
+        result = handle_job(job)
+    except Exception as e:
+        result = {"error": str(e)}
+    return {"id": job_id, "result": result}
+
+
+def serve_stream(handle_job, stdin=None, stdout=None):
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    for line in stdin:
+        if not line.strip():
+            continue
+        stdout.write(json.dumps(handle_line(line, handle_job)) + "\n")
+        stdout.flush()
+
+
+def serve_socket(handle_job, socket_path):
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    class JobHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                line = raw.decode("utf-8")
+                if not line.strip():
+                    continue
+                reply = json.dumps(handle_line(line, handle_job)) + "\n"
+                self.wfile.write(reply.encode("utf-8"))
+                self.wfile.flush()
+
+    # Deliberately not a ThreadingMixIn server: jobs share one session.
+    with socketserver.UnixStreamServer(socket_path, JobHandler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            os.remove(socket_path)
+
+
+def run_worker(handle_job, argv=None):
+    parser = argparse.ArgumentParser(description="Serve JSON-lines jobs from stdin or a Unix socket.")
+    parser.add_argument("--worker", action="store_true", help="run as a long-lived worker")
+    parser.add_argument("--socket", help="listen on this Unix socket path instead of stdin")
+    args = parser.parse_args(argv)
+    if args.socket:
+        serve_socket(handle_job, args.socket)
+    else:
+        serve_stream(handle_job)